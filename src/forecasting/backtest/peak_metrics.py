@@ -7,6 +7,10 @@ Focuses on preventing stockouts and understaffing on high-demand days.
 import numpy as np
 import pandas as pd
 
+# Open-ended outer bins: h <= 7 -> "1-7", h > 90 -> "91-380"
+_BINS = [-np.inf, 7, 14, 30, 90, np.inf]
+_LABELS = ["1-7", "8-14", "15-30", "31-90", "91-380"]
+
 
 def compute_peak_metrics(df_preds: pd.DataFrame, peak_percentile: float = 0.9) -> dict:
     """
@@ -95,7 +99,9 @@ def compute_peak_metrics_by_horizon(
     if "horizon_bucket" not in df_preds.columns:
         # Add horizon bucket if missing
         df_preds = df_preds.copy()
-        df_preds["horizon_bucket"] = df_preds["horizon"].apply(assign_horizon_bucket)
+        df_preds["horizon_bucket"] = (
+            pd.cut(df_preds["horizon"], bins=_BINS, labels=_LABELS).astype(object).fillna("91-380")
+        )
 
     results = []
 
@@ -107,20 +113,6 @@ def compute_peak_metrics_by_horizon(
     return pd.DataFrame(results)
 
 
-def assign_horizon_bucket(h):
-    """Assign horizon to bucket."""
-    if h <= 7:
-        return "1-7"
-    elif h <= 14:
-        return "8-14"
-    elif h <= 30:
-        return "15-30"
-    elif h <= 90:
-        return "31-90"
-    else:
-        return "91-380"
-
-
 def compute_combined_score(metrics: dict, weights: dict = None) -> float:
     """
     Compute combined operational score for model selection.
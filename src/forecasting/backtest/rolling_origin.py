@@ -6,10 +6,15 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from forecasting.io.parquet import save_frame
 from forecasting.models.baselines import SeasonalNaiveWeekly, WeekdayRollingMedian
 
 logger = logging.getLogger(__name__)
 
+# Right-closed horizon bins: (0, 7] -> "1-7", ..., (90, 380] -> "91-380"
+_BINS = [0, 7, 14, 30, 90, 380]
+_LABELS = ["1-7", "8-14", "15-30", "31-90", "91-380"]
+
 
 def assign_horizon_bucket(horizon: int) -> str:
     """Assign horizon to bucket."""
@@ -27,6 +32,11 @@ def assign_horizon_bucket(horizon: int) -> str:
         return "other"
 
 
+def assign_horizon_buckets(horizon: pd.Series) -> pd.Series:
+    """Vectorized assign_horizon_bucket: bucket labels for a Series of horizons."""
+    return pd.cut(horizon, bins=_BINS, labels=_LABELS).astype(object).fillna("other")
+
+
 def compute_metrics(df_preds: pd.DataFrame) -> pd.DataFrame:
     """
     Compute metrics from predictions.
@@ -120,10 +130,10 @@ def run_baseline_backtest(
             start=cutoff_date + pd.Timedelta(days=1),
             end=cutoff_date + pd.Timedelta(days=h_eval),
             freq="D",
-        ).tolist()
+        )
 
         # Filter to dates that exist in sales (for labels)
-        target_dates = [d for d in target_dates if d in df_sales["ds"].values]
+        target_dates = target_dates[target_dates.isin(df_sales["ds"])].tolist()
 
         if len(target_dates) == 0:
             continue
@@ -156,7 +166,7 @@ def run_baseline_backtest(
 
         # Add horizon and bucket
         preds["horizon"] = (preds["target_date"] - preds["issue_date"]).dt.days
-        preds["horizon_bucket"] = preds["horizon"].apply(assign_horizon_bucket)
+        preds["horizon_bucket"] = assign_horizon_buckets(preds["horizon"])
 
         all_preds.append(preds)
 
@@ -184,7 +194,7 @@ def run_baseline_backtest(
 
     output_preds_obj = Path(output_preds_path)
     output_preds_obj.parent.mkdir(parents=True, exist_ok=True)
-    df_preds.to_parquet(output_preds_path, index=False)
+    save_frame(df_preds, output_preds_path)
     logger.info(f"Saved predictions to {output_preds_path}")
 
     return df_metrics, df_preds
@@ -9,6 +9,7 @@ from forecasting.features.feature_builders import (
     build_features_long,
     build_features_short,
 )
+from forecasting.io.parquet import save_parquet
 
 logger = logging.getLogger(__name__)
 
@@ -149,7 +150,7 @@ def build_train_datasets(
         # Save
         output_path_obj = Path(output_short_path)
         output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-        df_train_short.to_parquet(output_short_path, index=False)
+        save_parquet(df_train_short, output_short_path)
         logger.info(
             f"Saved short-horizon training data to {output_short_path} ({len(df_train_short)} rows, {len(df_train_short.columns)} columns)"
         )
@@ -184,7 +185,7 @@ def build_train_datasets(
         # Save
         output_path_obj = Path(output_long_path)
         output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-        df_train_long.to_parquet(output_long_path, index=False)
+        save_parquet(df_train_long, output_long_path)
         logger.info(
             f"Saved long-horizon training data to {output_long_path} ({len(df_train_long)} rows, {len(df_train_long.columns)} columns)"
         )
@@ -265,7 +266,7 @@ def build_inference_features(
     # Save
     output_path_obj = Path(output_short_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df_inf_short.to_parquet(output_short_path, index=False)
+    save_parquet(df_inf_short, output_short_path)
     logger.info(f"Saved short-horizon features to {output_short_path} ({len(df_inf_short)} rows)")
 
     # Build long-horizon features (H=15-380)
@@ -286,7 +287,7 @@ def build_inference_features(
     # Save
     output_path_obj = Path(output_long_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df_inf_long.to_parquet(output_long_path, index=False)
+    save_parquet(df_inf_long, output_long_path)
     logger.info(f"Saved long-horizon features to {output_long_path} ({len(df_inf_long)} rows)")
 
     return df_inf_short, df_inf_long
@@ -5,6 +5,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from forecasting.io.parquet import save_parquet
+
 logger = logging.getLogger(__name__)
 
 
@@ -189,7 +191,7 @@ def build_events_daily_history(
     # Save
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df_features.to_parquet(output_path, index=False)
+    save_parquet(df_features, output_path)
     logger.info(
         f"Saved historical event features to {output_path} ({len(df_features)} rows, {len(df_features.columns)} columns)"
     )
@@ -362,7 +364,7 @@ def build_events_daily_forecast(
     # Save
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df_features.to_parquet(output_path, index=False)
+    save_parquet(df_features, output_path)
     logger.info(
         f"Saved 2026 event features to {output_path} ({len(df_features)} rows, {len(df_features.columns)} columns)"
     )
@@ -6,10 +6,13 @@ Clamped to +/- 60 days to stabilize.
 """
 
 from datetime import timedelta
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
 
+@lru_cache(maxsize=None)
 def get_thanksgiving_date(year: int) -> pd.Timestamp:
     """Get Thanksgiving date (4th Thursday of November) for given year."""
     nov_1 = pd.Timestamp(year, 11, 1)
@@ -21,16 +24,78 @@ def get_thanksgiving_date(year: int) -> pd.Timestamp:
     return thanksgiving
 
 
+@lru_cache(maxsize=None)
 def get_christmas_date(year: int) -> pd.Timestamp:
     """Get Christmas date for given year."""
     return pd.Timestamp(year, 12, 25)
 
 
+@lru_cache(maxsize=None)
 def get_new_year_date(year: int) -> pd.Timestamp:
     """Get New Year's Day for given year."""
     return pd.Timestamp(year, 1, 1)
 
 
+HOLIDAY_NAMES = ("thanksgiving", "christmas", "new_year")
+
+
+@lru_cache(maxsize=None)
+def _holiday_table(min_year: int, max_year: int) -> np.ndarray:
+    """
+    Build a (Y, 3) datetime64[D] table of holiday dates for min_year..max_year.
+
+    Row i holds the dates for year min_year + i; columns follow HOLIDAY_NAMES.
+    """
+    table = np.array(
+        [
+            [
+                get_thanksgiving_date(y).to_datetime64(),
+                get_christmas_date(y).to_datetime64(),
+                get_new_year_date(y).to_datetime64(),
+            ]
+            for y in range(min_year, max_year + 1)
+        ],
+        dtype="datetime64[D]",
+    )
+    table.flags.writeable = False
+    return table
+
+
+def _holiday_distances(
+    ds_days: np.ndarray, hol_days: np.ndarray, clamp_days: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Distance kernel on int64 day numbers (days since epoch).
+
+    Args:
+        ds_days: Dates to featurize
+        hol_days: Sorted holiday dates
+        clamp_days: Maximum distance
+
+    Returns:
+        (days_until, days_since) to the next holiday on/after and the previous
+        holiday on/before each date, clamped to [0, clamp_days]. Both are 0 on
+        the holiday itself; a missing neighbour counts as clamp_days.
+    """
+    n_hol = len(hol_days)
+
+    # Next holiday on or after ds
+    idx_next = np.searchsorted(hol_days, ds_days, side="left")
+    days_until = np.where(
+        idx_next < n_hol, hol_days[np.minimum(idx_next, n_hol - 1)] - ds_days, clamp_days
+    )
+
+    # Previous holiday on or before ds
+    idx_prev = np.searchsorted(hol_days, ds_days, side="right") - 1
+    days_since = np.where(idx_prev >= 0, ds_days - hol_days[np.maximum(idx_prev, 0)], clamp_days)
+
+    # Clamp once per output, in place (both arrays are fresh from np.where)
+    np.clip(days_until, 0, clamp_days, out=days_until)
+    np.clip(days_since, 0, clamp_days, out=days_since)
+
+    return days_until, days_since
+
+
 def add_holiday_distance_features(df: pd.DataFrame, clamp_days: int = 60) -> pd.DataFrame:
     """
     Add holiday distance features to dataframe.
@@ -47,81 +112,35 @@ def add_holiday_distance_features(df: pd.DataFrame, clamp_days: int = 60) -> pd.
     Returns:
         DataFrame with holiday distance features added
     """
-    df = df.copy()
+    # Shallow copy: only whole columns are added/replaced below, so the
+    # caller's frame is untouched without duplicating its data
+    df = df.copy(deep=False)
 
     # Ensure ds is datetime
     if not pd.api.types.is_datetime64_any_dtype(df["ds"]):
         df["ds"] = pd.to_datetime(df["ds"])
 
-    # Get unique years in data
-    years = sorted(df["ds"].dt.year.unique())
-
-    # Build holiday date lookup
-    holidays = {}
-    for year in range(min(years) - 1, max(years) + 2):  # Include adjacent years
-        holidays[f"thanksgiving_{year}"] = get_thanksgiving_date(year)
-        holidays[f"christmas_{year}"] = get_christmas_date(year)
-        holidays[f"new_year_{year}"] = get_new_year_date(year)
-
-    # Initialize features
-    df["days_until_thanksgiving"] = clamp_days
-    df["days_since_thanksgiving"] = clamp_days
-    df["days_until_christmas"] = clamp_days
-    df["days_since_christmas"] = clamp_days
-    df["days_until_new_year"] = clamp_days
-    df["days_since_new_year"] = clamp_days
-
-    # Compute distances for each row
-    for idx, row in df.iterrows():
-        ds = row["ds"]
-        year = ds.year
-
-        # Thanksgiving - find closest
-        min_until = clamp_days
-        min_since = clamp_days
-        for y in [year - 1, year, year + 1]:
-            thanksgiving = get_thanksgiving_date(y)
-            days_diff = (thanksgiving - ds).days
-            if days_diff > 0:  # Future
-                min_until = min(min_until, days_diff)
-            elif days_diff < 0:  # Past
-                min_since = min(min_since, -days_diff)
-            elif days_diff == 0:  # On the holiday itself
-                min_until = 0
-                min_since = 0
-        df.loc[idx, "days_until_thanksgiving"] = min(min_until, clamp_days)
-        df.loc[idx, "days_since_thanksgiving"] = min(min_since, clamp_days)
-
-        # Christmas - find closest
-        min_until = clamp_days
-        min_since = clamp_days
-        for y in [year - 1, year, year + 1]:
-            christmas = get_christmas_date(y)
-            days_diff = (christmas - ds).days
-            if days_diff > 0:  # Future
-                min_until = min(min_until, days_diff)
-            elif days_diff < 0:  # Past
-                min_since = min(min_since, -days_diff)
-            elif days_diff == 0:  # On the holiday itself
-                min_until = 0
-                min_since = 0
-        df.loc[idx, "days_until_christmas"] = min(min_until, clamp_days)
-        df.loc[idx, "days_since_christmas"] = min(min_since, clamp_days)
-
-        # New Year - find closest
-        min_until = clamp_days
-        min_since = clamp_days
-        for y in [year, year + 1, year + 2]:  # New Year is in January
-            new_year = get_new_year_date(y)
-            days_diff = (new_year - ds).days
-            if days_diff > 0:  # Future
-                min_until = min(min_until, days_diff)
-            elif days_diff < 0:  # Past
-                min_since = min(min_since, -days_diff)
-            elif days_diff == 0:  # On the holiday itself
-                min_until = 0
-                min_since = 0
-        df.loc[idx, "days_until_new_year"] = min(min_until, clamp_days)
-        df.loc[idx, "days_since_new_year"] = min(min_since, clamp_days)
+    # Holiday table indexed by year offset, spanning the data range plus
+    # adjacent years; each column is sorted, so the next/previous occurrence
+    # for every row is a single searchsorted.
+    ds_years = df["ds"].dt.year.to_numpy()
+    table = _holiday_table(int(ds_years.min()) - 1, int(ds_years.max()) + 2)
+    ds_days = df["ds"].values.astype("datetime64[D]").view(np.int64)
+
+    # Distances are bounded by clamp_days, so a narrow integer dtype suffices
+    # (int8 for the default 60) and keeps the feature matrix compact
+    dist_dtype = np.int8 if clamp_days <= np.iinfo(np.int8).max else np.int16
+    features = np.empty((len(df), 2 * len(HOLIDAY_NAMES)), dtype=dist_dtype)
+    feature_cols = []
+    for col, name in enumerate(HOLIDAY_NAMES):
+        days_until, days_since = _holiday_distances(
+            ds_days, table[:, col].view(np.int64), clamp_days
+        )
+        features[:, 2 * col] = days_until
+        features[:, 2 * col + 1] = days_since
+        feature_cols += [f"days_until_{name}", f"days_since_{name}"]
+
+    # Single assignment for all six features (one block insertion)
+    df[feature_cols] = features
 
     return df
@@ -8,13 +8,98 @@ FIXED in V4.2 based on ChatGPT 5.2 Pro audit:
 """
 
 import logging
-from typing import Dict
+import warnings
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    "compute_oof_spike_multipliers",
+    "apply_spike_overlay",
+    "generate_oof_overlay_report",
+]
+
+
+def _ensure_dt(s: pd.Series) -> pd.Series:
+    """Return s as datetime, parsing (with a format cache) only if needed."""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    return pd.to_datetime(s, cache=True)
+
+
+def _merge_ratio(
+    df_predictions: pd.DataFrame,
+    df_actuals: pd.DataFrame,
+    df_spike_flags: pd.DataFrame,
+    id_col: str = "ds",
+) -> pd.DataFrame:
+    """
+    Normalize schemas and merge predictions, actuals and spike flags on date.
+
+    Returns one row per date with yhat_p50, y, the is_* flag columns and
+    ratio = y / yhat_p50 (NaN where the prediction is not positive).
+    """
+    # Shallow copies: columns below are replaced, never written in place,
+    # so the caller's frames are untouched without duplicating their data
+    preds = df_predictions.copy(deep=False)
+
+    # ---- Schema Normalization ----
+    # Handle different date column names
+    if id_col not in preds.columns:
+        if "target_date" in preds.columns:
+            preds = preds.rename(columns={"target_date": id_col})
+        else:
+            raise ValueError(f"df_predictions missing '{id_col}' or 'target_date'")
+
+    # Handle different prediction column names
+    if "yhat_p50" not in preds.columns:
+        if "p50" in preds.columns:
+            preds = preds.rename(columns={"p50": "yhat_p50"})
+        elif "yhat" in preds.columns:
+            preds = preds.rename(columns={"yhat": "yhat_p50"})
+        else:
+            raise ValueError("df_predictions missing 'yhat_p50' (or 'p50'/'yhat')")
+
+    preds[id_col] = _ensure_dt(preds[id_col])
+
+    # If multiple predictions per day exist, reduce to one (median is robust)
+    yhat = preds.groupby(id_col)["yhat_p50"].median()
+
+    # ---- Normalize Actuals ----
+    actuals = df_actuals.copy(deep=False)
+    if "y" not in actuals.columns:
+        if "Net sales" in actuals.columns:
+            actuals = actuals.rename(columns={"Net sales": "y"})
+        else:
+            raise ValueError("df_actuals missing 'y' (or 'Net sales')")
+
+    actuals_y = actuals.set_index(_ensure_dt(actuals[id_col]))["y"]
+    actuals_y = actuals_y[~actuals_y.index.duplicated()]
+
+    # ---- Normalize Flags ----
+    flags = df_spike_flags.drop(columns=[id_col]).set_index(_ensure_dt(df_spike_flags[id_col]))
+    flags = flags[~flags.index.duplicated()]
+
+    # ---- Align on date index (inner on actuals, left on flags) ----
+    dates = yhat.index[yhat.index.isin(actuals_y.index)]
+    merged = pd.concat(
+        [yhat.reindex(dates), actuals_y.reindex(dates), flags.reindex(dates)], axis=1
+    )
+    merged.index.name = id_col
+    merged = merged.reset_index().fillna(0)
+
+    # Divide only where the prediction is positive; other rows stay NaN
+    yhat_vec = merged["yhat_p50"].to_numpy(dtype=float)
+    ratio = np.full(len(merged), np.nan)
+    np.divide(merged["y"].to_numpy(dtype=float), yhat_vec, out=ratio, where=yhat_vec > 0)
+    merged["ratio"] = ratio
+
+    return merged
+
 
 def compute_oof_spike_multipliers(
     df_predictions: pd.DataFrame,
@@ -25,7 +110,8 @@ def compute_oof_spike_multipliers(
     shrinkage: float = 0.65,  # Shrink toward 1.0 for stability
     cap_low: float = 0.85,  # Prevent over-correction downward
     cap_high: float = 1.80,  # Prevent over-correction upward
-) -> Dict[str, float]:
+    return_merged: bool = False,
+) -> Union[Dict[str, float], Tuple[Dict[str, float], pd.DataFrame]]:
     """
     Compute multipliers from OOF residual ratios on spike days.
 
@@ -55,91 +141,91 @@ def compute_oof_spike_multipliers(
         Lower bound for multiplier
     cap_high : float
         Upper bound for multiplier
+    return_merged : bool
+        If True, also return the merged actuals/predictions/flags frame
+        (with ratio column) so callers such as generate_oof_overlay_report
+        can reuse it instead of merging again
 
     Returns
     -------
     Dict[str, float]
         Multipliers for each spike flag
+        (or tuple of (multipliers, merged frame) if return_merged=True)
     """
-    preds = df_predictions.copy()
-
-    # ---- Schema Normalization ----
-    # Handle different date column names
-    if id_col not in preds.columns:
-        if "target_date" in preds.columns:
-            preds = preds.rename(columns={"target_date": id_col})
-        else:
-            raise ValueError(f"df_predictions missing '{id_col}' or 'target_date'")
-
-    # Handle different prediction column names
-    if "yhat_p50" not in preds.columns:
-        if "p50" in preds.columns:
-            preds = preds.rename(columns={"p50": "yhat_p50"})
-        elif "yhat" in preds.columns:
-            preds = preds.rename(columns={"yhat": "yhat_p50"})
-        else:
-            raise ValueError("df_predictions missing 'yhat_p50' (or 'p50'/'yhat')")
-
-    preds[id_col] = pd.to_datetime(preds[id_col])
-
-    # If multiple predictions per day exist, reduce to one (median is robust)
-    preds = preds.groupby(id_col, as_index=False)["yhat_p50"].median()
-
-    # ---- Normalize Actuals ----
-    actuals = df_actuals.copy()
-    if "y" not in actuals.columns:
-        if "Net sales" in actuals.columns:
-            actuals = actuals.rename(columns={"Net sales": "y"})
-        else:
-            raise ValueError("df_actuals missing 'y' (or 'Net sales')")
-
-    actuals[id_col] = pd.to_datetime(actuals[id_col])
-
-    # ---- Normalize Flags ----
-    flags = df_spike_flags.copy()
-    flags[id_col] = pd.to_datetime(flags[id_col])
-
-    # ---- Merge ----
-    merged = (
-        preds.merge(actuals[[id_col, "y"]], on=id_col, how="inner")
-        .merge(flags, on=id_col, how="left")
-        .fillna(0)
-    )
-
-    merged["ratio"] = np.where(merged["yhat_p50"] > 0, merged["y"] / merged["yhat_p50"], np.nan)
+    merged = _merge_ratio(df_predictions, df_actuals, df_spike_flags, id_col=id_col)
 
     # ---- Compute Multipliers ----
+    # All flags at once: mask ratios into an (N, K) matrix with NaN outside
+    # each flag's rows, then take column-wise counts and medians.
     multipliers = {}
-    flag_cols = [c for c in flags.columns if c.startswith("is_")]
-
-    for flag in flag_cols:
-        rows = merged[merged[flag].astype(int) == 1]
-        rows = rows[np.isfinite(rows["ratio"])]
-
-        if len(rows) < min_observations:
+    flag_cols = [c for c in merged.columns if c.startswith("is_")]
+
+    ratio_vec = merged["ratio"].to_numpy(dtype=float)
+    flags_mat = merged[flag_cols].to_numpy(dtype=np.int8) != 0
+    flags_mat &= np.isfinite(ratio_vec)[:, None]
+    masked = np.where(flags_mat, ratio_vec[:, None], np.nan)
+
+    counts = flags_mat.sum(axis=0)
+    with warnings.catch_warnings():
+        # All-NaN columns (flags with no observations) are skipped below
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        raw_medians = np.nanmedian(masked, axis=0)
+
+    # Shrink toward 1.0 for stability, then cap to prevent instability
+    shrunk_all = 1.0 + shrinkage * (raw_medians - 1.0)
+    capped_all = np.clip(shrunk_all, cap_low, cap_high)
+
+    for flag, n_obs, raw, shrunk, capped in zip(
+        flag_cols, counts, raw_medians, shrunk_all, capped_all
+    ):
+        if n_obs < min_observations:
             logger.warning(
-                f"Spike flag '{flag}' has only {len(rows)} observations (min: {min_observations}), skipping"
+                f"Spike flag '{flag}' has only {n_obs} observations (min: {min_observations}), skipping"
             )
             continue
 
-        # Compute raw multiplier (median is robust to outliers)
-        raw = float(np.median(rows["ratio"]))
-
-        # Shrink toward 1.0 for stability
-        shrunk = 1.0 + shrinkage * (raw - 1.0)
-
-        # Cap to prevent instability
-        capped = float(np.clip(shrunk, cap_low, cap_high))
-
-        multipliers[flag] = capped
+        multipliers[flag] = float(capped)
 
         logger.info(
-            f"Spike flag '{flag}': {len(rows)} obs, raw={raw:.3f}, shrunk={shrunk:.3f}, capped={capped:.3f}"
+            f"Spike flag '{flag}': {n_obs} obs, raw={raw:.3f}, shrunk={shrunk:.3f}, capped={capped:.3f}"
         )
 
+    if return_merged:
+        return multipliers, merged
     return multipliers
 
 
+@lru_cache(maxsize=8)
+def _build_mult_vector(
+    dates_key: bytes, flags_key: bytes, multipliers_key: Tuple[Tuple[str, float], ...]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the date-sorted flag table and per-date overlay multiplier.
+
+    Keys are the raw bytes of the flag dates (datetime64[ns]) and flag matrix
+    (int8, one column per multipliers_key entry), so repeated overlays with the
+    same flags and multipliers skip the sort and max-reduction.
+
+    Returns (sorted dates, sorted flag matrix, per-date multiplier).
+    """
+    dates = np.frombuffer(dates_key, dtype="datetime64[ns]")
+    flags_mat = np.frombuffer(flags_key, dtype=np.int8).reshape(len(dates), len(multipliers_key))
+
+    order = np.argsort(dates, kind="stable")
+    dates_sorted = dates[order]
+    flags_sorted = flags_mat[order]
+
+    mult = np.ones(len(dates), dtype=float)
+    for k, (_, m) in enumerate(multipliers_key):
+        np.maximum(mult, m, out=mult, where=flags_sorted[:, k] != 0)
+
+    # Shared across calls via the cache, so keep them read-only
+    for arr in (dates_sorted, flags_sorted, mult):
+        arr.flags.writeable = False
+
+    return dates_sorted, flags_sorted, mult
+
+
 def apply_spike_overlay(
     df_forecast: pd.DataFrame,
     df_spike_flags: pd.DataFrame,
@@ -170,12 +256,10 @@ def apply_spike_overlay(
     pd.DataFrame
         Forecast with overlay applied
     """
-    df = df_forecast.copy()
-
     # Normalize forecast date column
     forecast_date_col = id_col
-    if id_col not in df.columns:
-        if "target_date" in df.columns:
+    if id_col not in df_forecast.columns:
+        if "target_date" in df_forecast.columns:
             forecast_date_col = "target_date"
         else:
             raise ValueError(f"df_forecast missing '{id_col}' or 'target_date'")
@@ -188,40 +272,52 @@ def apply_spike_overlay(
         else:
             raise ValueError(f"df_spike_flags missing '{id_col}' or 'target_date'")
 
-    # Merge spike flags (handle different column names)
-    flag_cols = list(multipliers.keys())
-    if forecast_date_col == flags_date_col:
-        df = df.merge(
-            df_spike_flags[[flags_date_col] + flag_cols], on=forecast_date_col, how="left"
-        ).fillna(0)
-    else:
-        # Rename to match before merge
-        df_flags_temp = df_spike_flags[[flags_date_col] + flag_cols].copy()
-        df_flags_temp = df_flags_temp.rename(columns={flags_date_col: forecast_date_col})
-        df = df.merge(df_flags_temp, on=forecast_date_col, how="left").fillna(0)
+    flag_cols = [f for f in multipliers if f in df_spike_flags.columns]
+    for flag in multipliers:
+        if flag not in df_spike_flags.columns:
+            logger.warning(f"Spike flag '{flag}' not found in spike flags, skipping")
 
-    # Build per-row multiplier = max(multiplier for any active flag)
+    # Per-flag-date multiplier = max(multiplier for any active flag), cached
+    # across calls with the same flags and multipliers.
     # This prevents compounding when multiple flags are active
-    mult = np.ones(len(df), dtype=float)
+    flag_dates = _ensure_dt(df_spike_flags[flags_date_col]).to_numpy(dtype="datetime64[ns]")
+    flags_mat = df_spike_flags[flag_cols].fillna(0).to_numpy(dtype=np.int8)
+    dates_sorted, flags_sorted, mult_sorted = _build_mult_vector(
+        flag_dates.tobytes(),
+        flags_mat.tobytes(),
+        tuple((f, float(multipliers[f])) for f in flag_cols),
+    )
 
-    for flag, m in multipliers.items():
-        if flag not in df.columns:
-            logger.warning(f"Spike flag '{flag}' not found in forecast, skipping")
-            continue
+    # Align forecast dates onto the flag table (missing dates = no flags)
+    fc_dates = _ensure_dt(df_forecast[forecast_date_col]).to_numpy(dtype="datetime64[ns]")
+    pos = np.searchsorted(dates_sorted, fc_dates)
+    found = pos < len(dates_sorted)
+    found[found] = dates_sorted[pos[found]] == fc_dates[found]
+    pos = pos[found]
 
-        active = df[flag].astype(int).values == 1
-        mult = np.where(active, np.maximum(mult, m), mult)
+    mult = np.ones(len(fc_dates), dtype=float)
+    mult[found] = mult_sorted[pos]
 
-        n_active = active.sum()
+    # Shallow copy: only whole columns are added/replaced below
+    df = df_forecast.copy(deep=False)
+    if flag_cols:
+        aligned = np.zeros((len(fc_dates), len(flag_cols)), dtype=np.int8)
+        aligned[found] = flags_sorted[pos]
+        df[flag_cols] = aligned
+
+    for flag in flag_cols:
+        n_active = int((df[flag].to_numpy(copy=False) != 0).sum())
         if n_active > 0:
-            logger.info(f"Spike flag '{flag}': {n_active} days active, multiplier={m:.3f}")
+            logger.info(
+                f"Spike flag '{flag}': {n_active} days active, multiplier={multipliers[flag]:.3f}"
+            )
 
     df["overlay_multiplier"] = mult
 
-    # Apply to quantile columns
-    for q in ["p50", "p80", "p90"]:
-        if q in df.columns:
-            df[q] = df[q] * df["overlay_multiplier"]
+    # Apply to all present quantile columns in one 2D multiply
+    qcols = [q for q in ("p50", "p80", "p90") if q in df.columns]
+    if qcols:
+        df[qcols] = df[qcols].to_numpy(dtype=float) * mult[:, None]
 
     n_adjusted = (mult > 1.0).sum()
     logger.info(f"Applied overlay to {n_adjusted} days (multipliers > 1.0)")
@@ -230,7 +326,10 @@ def apply_spike_overlay(
 
 
 def generate_oof_overlay_report(
-    multipliers: Dict[str, float], df_forecast: pd.DataFrame, output_path: str
+    multipliers: Dict[str, float],
+    df_forecast: pd.DataFrame,
+    output_path: str,
+    df_merged: Optional[pd.DataFrame] = None,
 ) -> None:
     """
     Generate a report of OOF overlay multipliers and affected dates.
@@ -243,43 +342,61 @@ def generate_oof_overlay_report(
         Forecast with overlay applied (must have overlay_multiplier column)
     output_path : str
         Path to save report
+    df_merged : pd.DataFrame, optional
+        Merged OOF frame from compute_oof_spike_multipliers(return_merged=True).
+        If given, observation counts and raw median ratios are reported per flag.
     """
     report = []
     report.append("# OOF Spike Overlay Report")
     report.append("")
     report.append("## Multipliers by Spike Flag")
     report.append("")
-    report.append("| Spike Flag | Multiplier |")
-    report.append("|------------|------------|")
 
-    for flag, mult in sorted(multipliers.items(), key=lambda x: x[1], reverse=True):
-        report.append(f"| {flag} | {mult:.3f}x |")
+    if df_merged is not None:
+        report.append("| Spike Flag | Observations | Median Ratio | Multiplier |")
+        report.append("|------------|--------------|--------------|------------|")
+
+        ratio_vec = df_merged["ratio"].to_numpy(dtype=float)
+        valid = np.isfinite(ratio_vec)
+        for flag, mult in sorted(multipliers.items(), key=lambda x: x[1], reverse=True):
+            ratios = ratio_vec[valid & (df_merged[flag].to_numpy(dtype=np.int8) != 0)]
+            median_str = f"{np.median(ratios):.3f}" if len(ratios) > 0 else "N/A"
+            report.append(f"| {flag} | {len(ratios)} | {median_str} | {mult:.3f}x |")
+    else:
+        report.append("| Spike Flag | Multiplier |")
+        report.append("|------------|------------|")
+
+        report.extend(
+            f"| {flag} | {mult:.3f}x |"
+            for flag, mult in sorted(multipliers.items(), key=lambda x: x[1], reverse=True)
+        )
 
     report.append("")
     report.append("## Affected Dates")
     report.append("")
 
     if "overlay_multiplier" in df_forecast.columns:
-        affected = df_forecast[df_forecast["overlay_multiplier"] > 1.0].copy()
+        # Positional index of affected rows; only the first 20 are materialized
+        affected_idx = np.flatnonzero(df_forecast["overlay_multiplier"].to_numpy() > 1.0)
 
-        if len(affected) > 0:
-            report.append(f"Total days with overlay: {len(affected)}")
+        if len(affected_idx) > 0:
+            report.append(f"Total days with overlay: {len(affected_idx)}")
             report.append("")
             report.append("| Date | Multiplier | P50 Before | P50 After |")
             report.append("|------|------------|------------|-----------|")
 
-            for _, row in affected.head(20).iterrows():
-                date = row["ds"] if "ds" in row else row.name
-                mult = row["overlay_multiplier"]
-                p50_after = row["p50"] if "p50" in row else "N/A"
-                p50_before = p50_after / mult if p50_after != "N/A" else "N/A"
-
-                if p50_after != "N/A":
-                    report.append(
-                        f"| {date} | {mult:.3f}x | ${p50_before:,.0f} | ${p50_after:,.0f} |"
-                    )
+            has_ds = "ds" in df_forecast.columns
+            has_p50 = "p50" in df_forecast.columns
+            for row in df_forecast.iloc[affected_idx[:20]].itertuples():
+                date = row.ds if has_ds else row.Index
+                mult = row.overlay_multiplier
+                if has_p50:
+                    before_str = f"${row.p50 / mult:,.0f}"
+                    after_str = f"${row.p50:,.0f}"
                 else:
-                    report.append(f"| {date} | {mult:.3f}x | N/A | N/A |")
+                    before_str = after_str = "N/A"
+
+                report.append(f"| {date} | {mult:.3f}x | {before_str} | {after_str} |")
         else:
             report.append("No dates with overlay applied (all multipliers = 1.0)")
     else:
@@ -5,10 +5,104 @@ Captures single-day spikes (Black Friday, Memorial Day, etc.) and multi-day regi
 (year-end week, holiday weekends) that are systematically underpredicted by smoothing models.
 """
 
-from datetime import timedelta
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
+# Flag columns added by add_spike_day_features, in output order
+SPIKE_DAY_FLAGS = (
+    "is_thanksgiving_day",
+    "is_black_friday",
+    "is_day_after_thanksgiving",
+    "is_memorial_day",
+    "is_memorial_day_weekend",
+    "is_labor_day",
+    "is_labor_day_weekend",
+    "is_independence_day",
+    "is_independence_day_observed",
+    "is_christmas_eve",
+    "is_christmas_day",
+    "is_day_after_christmas",
+    "is_year_end_week",
+    "is_new_years_eve",
+)
+
+
+def _month_start_days(year: np.ndarray, month: int) -> np.ndarray:
+    """Days since epoch of the 1st of `month` in each `year`."""
+    months = (year.astype(np.int64) - 1970) * 12 + (month - 1)
+    return months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+
+def _weekday(days: np.ndarray) -> np.ndarray:
+    """Day of week (0=Monday, 6=Sunday) for days since epoch (1970-01-01 was a Thursday)."""
+    return (days + 3) % 7
+
+
+@lru_cache(maxsize=4)
+def _build_spike_day_table(year_min: int, year_max: int) -> pd.DataFrame:
+    """
+    Spike-day flags for every day of year_min..year_max, indexed by ds.
+
+    Cached on the year range, so repeated calls (training, backtest folds,
+    forecast) only pay for a positional lookup. Treat the result as read-only.
+    """
+    ds = pd.date_range(f"{year_min}-01-01", f"{year_max}-12-31", freq="D")
+    ds_days = ds.values.astype("datetime64[D]").astype(np.int64)
+
+    # Extract year, month, day as arrays
+    months = ds.values.astype("datetime64[M]")
+    year = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = (months.astype(np.int64) % 12 + 1).astype(np.uint8)
+    day = (ds_days - months.astype("datetime64[D]").astype(np.int64) + 1).astype(np.uint8)
+
+    # Holiday dates are computed once per year in closed form (as days since
+    # epoch) into a small per-year lookup table, then gathered per row by year
+    # offset and compared against ds, so no per-year loops or per-row date math
+    years = np.arange(year_min, year_max + 1)
+    year_idx = year - year_min
+
+    flags = {}
+
+    # Thanksgiving: 4th Thursday in November
+    # Black Friday: Friday after Thanksgiving
+    nov_1 = _month_start_days(years, 11)
+    thanksgiving = (nov_1 + (3 - _weekday(nov_1)) % 7 + 21)[year_idx]  # Thursday = 3
+    flags["is_thanksgiving_day"] = ds_days == thanksgiving
+    flags["is_black_friday"] = ds_days == thanksgiving + 1
+    flags["is_day_after_thanksgiving"] = ds_days == thanksgiving + 1
+
+    # Memorial Day: Last Monday in May (weekend = Sat/Sun/Mon)
+    may_31 = _month_start_days(years, 6) - 1
+    memorial_day = (may_31 - _weekday(may_31))[year_idx]  # Monday = 0
+    flags["is_memorial_day"] = ds_days == memorial_day
+    flags["is_memorial_day_weekend"] = (ds_days >= memorial_day - 2) & (ds_days <= memorial_day)
+
+    # Labor Day: First Monday in September (weekend = Sat/Sun/Mon)
+    sep_1 = _month_start_days(years, 9)
+    labor_day = (sep_1 + (-_weekday(sep_1)) % 7)[year_idx]
+    flags["is_labor_day"] = ds_days == labor_day
+    flags["is_labor_day_weekend"] = (ds_days >= labor_day - 2) & (ds_days <= labor_day)
+
+    # Independence Day: July 4th + observed
+    # Sunday -> observed Monday July 5, Saturday -> observed Friday July 3
+    july_4 = _month_start_days(years, 7) + 3
+    july_4_dow = _weekday(july_4)
+    observed = (july_4 + np.where(july_4_dow == 6, 1, np.where(july_4_dow == 5, -1, 0)))[year_idx]
+    flags["is_independence_day"] = (month == 7) & (day == 4)
+    flags["is_independence_day_observed"] = ds_days == observed
+
+    # Christmas and year-end
+    december = month == 12
+    flags["is_christmas_eve"] = december & (day == 24)
+    flags["is_christmas_day"] = december & (day == 25)
+    flags["is_day_after_christmas"] = december & (day == 26)
+    flags["is_year_end_week"] = december & (day >= 26) & (day <= 31)
+    flags["is_new_years_eve"] = december & (day == 31)
+
+    return pd.DataFrame(flags, index=ds)
+
 
 def add_spike_day_features(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -36,92 +130,51 @@ def add_spike_day_features(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with spike-day features added
     """
-    df = df.copy()
-
     # Ensure ds is datetime
-    if not pd.api.types.is_datetime64_any_dtype(df["ds"]):
-        df["ds"] = pd.to_datetime(df["ds"])
-
-    # Extract year, month, day, day of week
-    df["_year"] = df["ds"].dt.year
-    df["_month"] = df["ds"].dt.month
-    df["_day"] = df["ds"].dt.day
-    df["_dow"] = df["ds"].dt.dayofweek  # 0=Monday, 6=Sunday
-
-    # Thanksgiving: 4th Thursday in November
-    # Black Friday: Friday after Thanksgiving
-    df["is_thanksgiving_day"] = False
-    df["is_black_friday"] = False
-    df["is_day_after_thanksgiving"] = False
-
-    for year in df["_year"].unique():
-        # Find 4th Thursday in November
-        nov_days = pd.date_range(f"{year}-11-01", f"{year}-11-30", freq="D")
-        thursdays = [d for d in nov_days if d.dayofweek == 3]  # Thursday = 3
-        if len(thursdays) >= 4:
-            thanksgiving = thursdays[3]
-            black_friday = thanksgiving + timedelta(days=1)
-
-            df.loc[df["ds"] == thanksgiving, "is_thanksgiving_day"] = True
-            df.loc[df["ds"] == black_friday, "is_black_friday"] = True
-            df.loc[df["ds"] == black_friday, "is_day_after_thanksgiving"] = True
-
-    # Memorial Day: Last Monday in May
-    df["is_memorial_day"] = False
-    df["is_memorial_day_weekend"] = False
-
-    for year in df["_year"].unique():
-        may_days = pd.date_range(f"{year}-05-01", f"{year}-05-31", freq="D")
-        mondays = [d for d in may_days if d.dayofweek == 0]  # Monday = 0
-        if len(mondays) > 0:
-            memorial_day = mondays[-1]  # Last Monday
-            memorial_sat = memorial_day - timedelta(days=2)
-            memorial_sun = memorial_day - timedelta(days=1)
-
-            df.loc[df["ds"] == memorial_day, "is_memorial_day"] = True
-            df.loc[
-                df["ds"].isin([memorial_sat, memorial_sun, memorial_day]), "is_memorial_day_weekend"
-            ] = True
-
-    # Labor Day: First Monday in September
-    df["is_labor_day"] = False
-    df["is_labor_day_weekend"] = False
-
-    for year in df["_year"].unique():
-        sep_days = pd.date_range(f"{year}-09-01", f"{year}-09-30", freq="D")
-        mondays = [d for d in sep_days if d.dayofweek == 0]
-        if len(mondays) > 0:
-            labor_day = mondays[0]  # First Monday
-            labor_sat = labor_day - timedelta(days=2)
-            labor_sun = labor_day - timedelta(days=1)
-
-            df.loc[df["ds"] == labor_day, "is_labor_day"] = True
-            df.loc[df["ds"].isin([labor_sat, labor_sun, labor_day]), "is_labor_day_weekend"] = True
-
-    # Independence Day: July 4th + observed
-    df["is_independence_day"] = (df["_month"] == 7) & (df["_day"] == 4)
-    df["is_independence_day_observed"] = False
-
-    for year in df["_year"].unique():
-        july4 = pd.Timestamp(f"{year}-07-04")
-        if july4.dayofweek == 6:  # Sunday -> observed Monday July 5
-            df.loc[df["ds"] == july4 + timedelta(days=1), "is_independence_day_observed"] = True
-        elif july4.dayofweek == 5:  # Saturday -> observed Friday July 3
-            df.loc[df["ds"] == july4 - timedelta(days=1), "is_independence_day_observed"] = True
-        else:
-            df.loc[df["ds"] == july4, "is_independence_day_observed"] = True
+    ds = df["ds"]
+    new_cols = {}
+    if not pd.api.types.is_datetime64_any_dtype(ds):
+        ds = pd.to_datetime(ds)
+        new_cols["ds"] = ds
+
+    # No rows: no year range to build a table for, every flag is an empty bool column
+    if len(df) == 0:
+        new_cols.update({col: np.zeros(0, dtype=bool) for col in SPIKE_DAY_FLAGS})
+        return df.assign(**new_cols)
+
+    # Look up each row's flags in the cached table by day offset; the offset
+    # is exact for any date in the table's year range, so no per-date scans
+    ds_days = ds.values.astype("datetime64[D]")
+    year_range = np.array([ds_days.min(), ds_days.max()]).astype("datetime64[Y]")
+    years = year_range.astype(np.int64) + 1970
+    table = _build_spike_day_table(int(years[0]), int(years[1]))
+    pos = (ds_days - table.index.values[0].astype("datetime64[D]")).astype(np.int64)
+    for col in table.columns:
+        new_cols[col] = table[col].to_numpy().take(pos)
+
+    # One assignment for all flags (no per-column block insertions)
+    return df.assign(**new_cols)
+
+
+def spike_days_mask(df: pd.DataFrame, spike_cols: list = None) -> np.ndarray:
+    """
+    Boolean mask of rows where any spike-day flag is set.
 
-    # Christmas and year-end
-    df["is_christmas_eve"] = (df["_month"] == 12) & (df["_day"] == 24)
-    df["is_christmas_day"] = (df["_month"] == 12) & (df["_day"] == 25)
-    df["is_day_after_christmas"] = (df["_month"] == 12) & (df["_day"] == 26)
-    df["is_year_end_week"] = (df["_month"] == 12) & (df["_day"] >= 26) & (df["_day"] <= 31)
-    df["is_new_years_eve"] = (df["_month"] == 12) & (df["_day"] == 31)
+    Args:
+        df: DataFrame with spike-day flag columns
+        spike_cols: Flag columns to check (default: SPIKE_DAY_FLAGS present in df)
 
-    # Drop temporary columns
-    df = df.drop(columns=["_year", "_month", "_day", "_dow"])
+    Returns:
+        numpy bool array of length len(df)
+    """
+    if spike_cols is None:
+        spike_cols = [c for c in SPIKE_DAY_FLAGS if c in df.columns]
+    if len(spike_cols) == 0:
+        return np.zeros(len(df), dtype=bool)
 
-    return df
+    # One OR-reduction over the (N, F) flag matrix
+    flags = df[list(spike_cols)].to_numpy(dtype=bool)
+    return np.logical_or.reduce(flags, axis=1)
 
 
 def add_event_regime_features(df: pd.DataFrame, events_daily_df: pd.DataFrame) -> pd.DataFrame:
@@ -139,10 +192,16 @@ def add_event_regime_features(df: pd.DataFrame, events_daily_df: pd.DataFrame) -
     Returns:
         DataFrame with regime features added
     """
-    df = df.copy()
-
-    # Merge with events
-    df = df.merge(events_daily_df, on="ds", how="left")
+    # Align events onto df's dates by index instead of a hash merge on ds;
+    # fall back to merge when the lookup would not be one-to-one
+    events = events_daily_df.set_index("ds")
+    if events.index.is_unique and events.columns.intersection(df.columns).empty:
+        df = df.reset_index(drop=True)
+        aligned = events.reindex(df["ds"].to_numpy())
+        aligned.index = df.index
+        df = pd.concat([df, aligned], axis=1)
+    else:
+        df = df.merge(events_daily_df, on="ds", how="left")
 
     # Find event family columns
     event_cols = [
@@ -153,33 +212,28 @@ def add_event_regime_features(df: pd.DataFrame, events_daily_df: pd.DataFrame) -
         and not c.endswith("__days_to_end")
     ]
 
-    for event_col in event_cols:
+    if not event_cols:
+        return df
+
+    # Contiguous event windows for all families at once, as an (N, E) matrix:
+    # each row's offset from the start of its window and to the end of it
+    active = (df[event_cols] > 0).to_numpy(dtype=bool)
+    n = len(active)
+    pos = np.arange(n)[:, None]
+    prev_active = np.zeros_like(active)
+    prev_active[1:] = active[:-1]
+    next_active = np.zeros_like(active)
+    next_active[:-1] = active[1:]
+    window_start = np.maximum.accumulate(np.where(active & ~prev_active, pos, 0), axis=0)
+    window_end = np.minimum.accumulate(np.where(active & ~next_active, pos, n)[::-1], axis=0)[::-1]
+    day_index = np.where(active, pos - window_start, 0)
+    days_to_end = np.where(active, window_end - pos, 0)
+
+    new_cols = {}
+    for j, event_col in enumerate(event_cols):
         family_name = event_col.replace("event_family__", "")
-        day_index_col = f"event_family__{family_name}__day_index"
-        days_to_end_col = f"event_family__{family_name}__days_to_end"
-
-        # Initialize
-        df[day_index_col] = 0
-        df[days_to_end_col] = 0
-
-        # Find contiguous event windows
-        df["_active"] = df[event_col] > 0
-        df["_group"] = (df["_active"] != df["_active"].shift()).cumsum()
-
-        for group_id, group_df in df[df["_active"]].groupby("_group"):
-            if len(group_df) == 0:
-                continue
-
-            indices = group_df.index
-            window_length = len(indices)
-
-            # Assign day_index (0, 1, 2, ...)
-            df.loc[indices, day_index_col] = range(window_length)
-
-            # Assign days_to_end (n-1, n-2, ..., 0)
-            df.loc[indices, days_to_end_col] = list(reversed(range(window_length)))
-
-        # Clean up
-        df = df.drop(columns=["_active", "_group"])
+        # day_index (0, 1, 2, ...) and days_to_end (n-1, n-2, ..., 0)
+        new_cols[f"event_family__{family_name}__day_index"] = day_index[:, j]
+        new_cols[f"event_family__{family_name}__days_to_end"] = days_to_end[:, j]
 
-    return df
+    return df.assign(**new_cols)
@@ -17,8 +17,50 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from forecasting.features.spike_days import spike_days_mask
+
 logger = logging.getLogger(__name__)
 
+# Day of week (Monday=0) and month each spike flag falls on by definition, used
+# for the matched baseline. Flags whose DOW (or month) varies by year are absent
+# and take the most common value among their observations instead.
+SPIKE_FLAG_DOW = {
+    "is_black_friday": 4,
+    "is_thanksgiving_day": 3,
+    "is_day_after_thanksgiving": 4,
+    "is_memorial_day": 0,
+    "is_labor_day": 0,
+}
+SPIKE_FLAG_MONTH = {
+    "is_black_friday": 11,
+    "is_thanksgiving_day": 11,
+    "is_day_after_thanksgiving": 11,
+    "is_memorial_day": 5,
+    "is_memorial_day_weekend": 5,
+    "is_labor_day": 9,
+    "is_independence_day": 7,
+    "is_christmas_eve": 12,
+    "is_day_after_christmas": 12,
+    "is_year_end_week": 12,
+}
+
+
+def _most_common(values: np.ndarray) -> int:
+    """Most common non-negative integer in values (smallest on ties, like Series.mode)."""
+    return int(np.bincount(values.astype(np.int64)).argmax())
+
+
+def _as_bool_mask(flag: pd.Series) -> np.ndarray:
+    """
+    Return a spike flag column as a numpy bool mask, NaN-safe (NaN -> False).
+
+    Flags from add_spike_day_features are already bool and are returned as a
+    direct view; only other dtypes pay for fillna and a cast.
+    """
+    if pd.api.types.is_bool_dtype(flag.dtype) and not isinstance(flag.dtype, pd.BooleanDtype):
+        return flag.to_numpy()
+    return flag.fillna(False).to_numpy(dtype=bool)
+
 
 def compute_spike_uplift_priors(
     df_sales: pd.DataFrame,
@@ -46,14 +88,12 @@ def compute_spike_uplift_priors(
     Returns:
         DataFrame with spike_flag, uplift_multiplier, confidence, n_obs, baseline_method
     """
+    # Filter to open days only (and to ds_max if given) in a single selection;
+    # derived columns below are kept as local arrays, so no copies are needed
+    keep = ~df_sales["is_closed"]
     if ds_max is not None:
-        df_sales = df_sales[df_sales["ds"] <= ds_max].copy()
-    else:
-        df_sales = df_sales.copy()
-
-    # Filter to open days only
-    df_open = df_sales[~df_sales["is_closed"]].copy()
-    df_open = df_open.copy()  # Prevent SettingWithCopy warnings
+        keep &= df_sales["ds"] <= ds_max
+    df_open = df_sales.loc[keep]
 
     if len(df_open) == 0:
         logger.warning("No open days in sales history")
@@ -61,11 +101,15 @@ def compute_spike_uplift_priors(
             columns=["spike_flag", "uplift_multiplier", "confidence", "n_obs", "baseline_method"]
         )
 
-    # Add DOW and month if not present
-    if "dow" not in df_open.columns:
-        df_open["dow"] = df_open["ds"].dt.dayofweek
-    if "month" not in df_open.columns:
-        df_open["month"] = df_open["ds"].dt.month
+    # DOW and month (from ds if not present)
+    if "dow" in df_open.columns:
+        dow = df_open["dow"].to_numpy()
+    else:
+        dow = df_open["ds"].dt.dayofweek.to_numpy()
+    if "month" in df_open.columns:
+        month = df_open["month"].to_numpy()
+    else:
+        month = df_open["ds"].dt.month.to_numpy()
 
     # Spike flags to compute uplift for
     spike_flags = [
@@ -85,17 +129,21 @@ def compute_spike_uplift_priors(
     # Filter to flags that exist in data
     spike_flags = [f for f in spike_flags if f in df_open.columns]
 
-    # Ensure spike flags are boolean for safe masking (NaN-safe)
-    for flag in spike_flags:
-        if flag in df_open.columns:
-            df_open[flag] = df_open[flag].fillna(False).astype(bool)
+    # Precompute the baseline groupers once: positional rows per (dow, month)
+    # and per dow. Each flag then only filters its own group's rows instead of
+    # rescanning df_open for every fallback.
+    y = df_open["y"].to_numpy(dtype=np.float64)
+    positions = pd.Series(np.arange(len(df_open)))
+    dow_month_rows = positions.groupby([dow, month]).indices
+    dow_rows = positions.groupby(dow).indices
+    no_rows = np.array([], dtype=np.intp)
 
     results = []
 
     for flag in spike_flags:
-        # Get spike days
-        spike_days = df_open[df_open[flag]]
-        n_obs = len(spike_days)
+        # Get spike days (flags cast to bool NaN-safe for masking)
+        is_spike = _as_bool_mask(df_open[flag])
+        n_obs = int(is_spike.sum())
 
         if n_obs < min_observations:
             # Insufficient data, use neutral multiplier
@@ -112,24 +160,31 @@ def compute_spike_uplift_priors(
 
         # Compute matched baseline
         # Strategy: same DOW + same month, excluding spike days
-        spike_dow = spike_days["dow"].mode()[0] if len(spike_days) > 0 else None
-        spike_month = spike_days["month"].mode()[0] if len(spike_days) > 0 else None
+        if n_obs > 0:
+            spike_dow = SPIKE_FLAG_DOW.get(flag)
+            if spike_dow is None:
+                spike_dow = _most_common(dow[is_spike])
+            spike_month = SPIKE_FLAG_MONTH.get(flag)
+            if spike_month is None:
+                spike_month = _most_common(month[is_spike])
+        else:
+            spike_dow = spike_month = None
 
         # Try matched baseline: same DOW + same month, excluding spike flag
-        baseline_days = df_open[
-            (df_open["dow"] == spike_dow) & (df_open["month"] == spike_month) & (~df_open[flag])
-        ]
+        rows = dow_month_rows.get((spike_dow, spike_month), no_rows)
+        baseline_days = rows[~is_spike[rows]]
 
         baseline_method = "dow_month"
 
         # Fallback 1: same DOW across all months, excluding spike flag
         if len(baseline_days) < 3:
-            baseline_days = df_open[(df_open["dow"] == spike_dow) & (~df_open[flag])]
+            rows = dow_rows.get(spike_dow, no_rows)
+            baseline_days = rows[~is_spike[rows]]
             baseline_method = "dow_all"
 
         # Fallback 2: all non-spike days (last resort)
         if len(baseline_days) < 3:
-            baseline_days = df_open[~df_open[flag]]
+            baseline_days = np.flatnonzero(~is_spike)
             baseline_method = "all_nonspike"
 
         if len(baseline_days) == 0:
@@ -146,8 +201,8 @@ def compute_spike_uplift_priors(
             continue
 
         # Compute raw uplift
-        spike_median = spike_days["y"].median()
-        baseline_median = baseline_days["y"].median()
+        spike_median = pd.Series(y[is_spike]).median()
+        baseline_median = pd.Series(y[baseline_days]).median()
         raw_uplift = spike_median / baseline_median if baseline_median > 0 else 1.0
 
         # Apply shrinkage toward 1.0
@@ -213,42 +268,50 @@ def apply_spike_uplift_overlay(
     # Create uplift lookup
     uplift_map = dict(zip(df_uplift["spike_flag"], df_uplift["uplift_multiplier"]))
 
-    # Track adjustments
-    df["adjustment_log"] = ""
-    df["adjustment_multiplier"] = 1.0
-
-    # V5.0: Compute max multiplier per row (non-compounding)
-    for idx, row in df.iterrows():
-        active_flags = []
-        active_multipliers = []
-
-        for flag in spike_flags:
-            if flag not in df.columns:
-                continue
-            if flag not in uplift_map:
-                continue
-            if row[flag]:
-                active_flags.append(flag)
-                active_multipliers.append(uplift_map[flag])
-
-        if len(active_multipliers) > 0:
-            # Use MAX multiplier (not product)
-            max_multiplier = max(active_multipliers)
-            max_flag = active_flags[active_multipliers.index(max_multiplier)]
-
-            # Apply multiplier
-            df.loc[idx, "p50"] *= max_multiplier
-            df.loc[idx, "p80"] *= max_multiplier
-            df.loc[idx, "p90"] *= max_multiplier
-            df.loc[idx, "adjustment_multiplier"] = max_multiplier
-
-            # Log which flags were active and which was used
-            if len(active_flags) > 1:
-                df.loc[idx, "adjustment_log"] = (
-                    f"max({','.join(active_flags)})={max_multiplier:.3f}"
-                )
-            else:
-                df.loc[idx, "adjustment_log"] = f"{max_flag}={max_multiplier:.3f}"
+    # Flags that can contribute, in spike_flags order
+    flags_present = [f for f in spike_flags if f in df.columns and f in uplift_map]
+    mults = np.array([uplift_map[f] for f in flags_present], dtype=np.float64)
+
+    # Rows with any active flag; multiplier work below only touches these
+    any_active = spike_days_mask(df, flags_present)
+    final_mult = np.ones(len(df), dtype=np.float64)
+
+    # adjustment_log is categorical: one label per distinct combination of
+    # active flags, with "" (code 0) for rows without an adjustment
+    log_labels = [""]
+    log_codes = np.zeros(len(df), dtype=np.int32)
+
+    # Typical forecast windows contain no spike days: leave quantiles untouched
+    if not any_active.any():
+        df["adjustment_log"] = pd.Categorical.from_codes(log_codes, categories=log_labels)
+        df["adjustment_multiplier"] = final_mult
+        logger.info("Applied spike uplift overlay to 0 days")
+        return df
+
+    # (n_active, F) active-flag matrix; each row's multiplier is the max over
+    # its active flags (V5.0: non-compounding)
+    mask = df.loc[any_active, flags_present].to_numpy(dtype=bool)
+    final_mult[any_active] = np.where(mask, mults[None, :], -np.inf).max(axis=1)
+
+    # Log which flags were active and which was used; labels are built once
+    # per distinct combination of active flags, not once per row
+    combos, inverse = np.unique(mask, axis=0, return_inverse=True)
+    for combo in combos:
+        active_flags = [f for f, on in zip(flags_present, combo) if on]
+        max_multiplier = mults[combo].max()
+        if len(active_flags) > 1:
+            log_labels.append(f"max({','.join(active_flags)})={max_multiplier:.3f}")
+        else:
+            log_labels.append(f"{active_flags[0]}={max_multiplier:.3f}")
+    log_codes[any_active] = inverse.ravel() + 1
+
+    # Apply multiplier to all quantiles in one in-place pass, then write back
+    quantile_cols = ["p50", "p80", "p90"]
+    quantiles = df[quantile_cols].to_numpy(dtype=np.float64, copy=True)
+    quantiles *= final_mult[:, None]
+    df[quantile_cols] = quantiles
+    df["adjustment_log"] = pd.Categorical.from_codes(log_codes, categories=log_labels)
+    df["adjustment_multiplier"] = final_mult
 
     n_adjusted = (df["adjustment_multiplier"] != 1.0).sum()
     logger.info(f"Applied spike uplift overlay to {n_adjusted} days")
@@ -1,36 +1,242 @@
 """Event data ingestion and normalization."""
 
+import codecs
 import logging
+import os
 import re
 import unicodedata
+from collections.abc import Callable
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 logger = logging.getLogger(__name__)
 
+# Columns ingest_events_exact() uses (after snake_case normalization)
+_EXACT_EVENT_COLUMNS = frozenset(
+    {
+        "event_name",
+        "event_name_clean",
+        "event_name_ascii",
+        "category",
+        "proximity",
+        "start_date",
+        "end_date",
+    }
+)
 
-def to_ascii(text: str) -> str:
-    """Convert text to ASCII-safe string."""
-    if pd.isna(text):
-        return ""
+# Base columns ingest_recurring_event_mapping() uses, besides start_YYYY/end_YYYY
+_RECURRING_BASE_COLUMNS = frozenset(
+    {"event_family", "event_family_ascii", "category", "proximity", "recurrence_pattern"}
+)
+
+# Label columns with a handful of distinct values, stored as categoricals
+_CATEGORY_COLUMNS = ("category", "proximity", "recurrence_pattern")
+
+# Repeated label columns worth dictionary encoding in the parquet outputs
+_DICTIONARY_COLUMNS = ("category", "proximity", "event_family_ascii")
+
+# Year columns in the recurring mapping: start_YYYY, end_YYYY
+_YEAR_COL_RE = re.compile(r"^(start|end)_(\d{4})$")
+
+# Compiled once at import for to_snake_case()
+# Bytes read from the start of a CSV to pick its encoding
+_ENCODING_PROBE_BYTES = 64 * 1024
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_WS_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def _ascii_str(text: str) -> str:
+    """to_ascii() for a str; cached, since names and labels repeat across rows."""
+    # ASCII text is unchanged by NFKD and the ASCII round trip
+    if text.isascii():
+        return text.strip()
     # Normalize unicode
-    text = unicodedata.normalize("NFKD", str(text))
+    text = unicodedata.normalize("NFKD", text)
     # Remove non-ASCII
     text = text.encode("ascii", "ignore").decode("ascii")
     return text.strip()
 
 
+@lru_cache(maxsize=4096)
+def _snake_case_str(text: str) -> str:
+    """to_snake_case() for a str; cached, since column names repeat across files."""
+    text = text.strip()
+    # Replace spaces and special chars with underscore
+    text = _PUNCT_RE.sub("", text)
+    text = _WS_RE.sub("_", text)
+    return text.lower()
+
+
+def to_ascii(text: str) -> str:
+    """Convert text to ASCII-safe string."""
+    # NaN is handled before the cached call (NaN keys don't reliably hit the cache)
+    if pd.isna(text):
+        return ""
+    return _ascii_str(str(text))
+
+
+def _to_ascii_series(values: pd.Series) -> pd.Series:
+    """
+    Vectorized to_ascii() over a Series (NaN -> "").
+
+    Values that are already ASCII skip the NFKD normalization entirely; only
+    the remaining rows go through the cached per-string conversion.
+    """
+    # NaN is filled once for the whole Series, so the per-value loops below
+    # only ever see str
+    text = values.astype("string").fillna("")
+    # str.isascii is a C-level check (Series.str.isascii needs pandas >= 3.0)
+    non_ascii = np.array([not t.isascii() for t in text], dtype=bool)
+    if non_ascii.any():
+        text.loc[non_ascii] = [_ascii_str(t) for t in text[non_ascii]]
+    return text.str.strip().astype(str)
+
+
 def to_snake_case(text: str) -> str:
     """Convert text to snake_case."""
     if pd.isna(text):
         return ""
-    text = str(text).strip()
-    # Replace spaces and special chars with underscore
-    text = re.sub(r"[^\w\s]", "", text)
-    text = re.sub(r"\s+", "_", text)
-    return text.lower()
+    return _snake_case_str(str(text))
+
+
+def _swap_where(df: pd.DataFrame, a: str, b: str, mask: np.ndarray) -> None:
+    """Swap the values of columns a and b in place on rows where mask is True."""
+    arr_a = df[a].to_numpy(copy=True)
+    arr_b = df[b].to_numpy(copy=True)
+    arr_a[mask], arr_b[mask] = arr_b[mask], arr_a[mask]
+    df[a] = arr_a
+    df[b] = arr_b
+
+
+def _detect_encoding(input_path: str) -> str:
+    """
+    Pick a CSV's encoding before parsing it.
+
+    Uses the byte-order mark when there is one; otherwise the first
+    _ENCODING_PROBE_BYTES are checked as UTF-8 (a character split at the end of
+    the prefix is not counted as invalid), falling back to latin1 if they don't
+    decode.
+    """
+    with open(input_path, "rb") as f:
+        raw = f.read(_ENCODING_PROBE_BYTES + 1)
+    truncated = len(raw) > _ENCODING_PROBE_BYTES
+    raw = raw[:_ENCODING_PROBE_BYTES]
+    if raw.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
+    if raw[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        return "utf-16"
+    try:
+        # Incremental decode holds back an incomplete trailing sequence of a truncated prefix
+        codecs.getincrementaldecoder("utf-8")().decode(raw, final=not truncated)
+    except UnicodeDecodeError as e:
+        logger.warning(f"UTF-8 encoding failed ({e}), trying latin1")
+        return "latin1"
+    return "utf-8"
+
+
+def _read_csv_columns(
+    input_path: str, encoding: str, keep: Callable[[str], bool] | None
+) -> pd.DataFrame:
+    """Read a CSV with the pyarrow engine, only parsing columns whose snake_case name is kept."""
+    usecols = None
+    if keep is not None:
+        header = pd.read_csv(input_path, encoding=encoding, nrows=0).columns
+        usecols = [col for col in header if keep(_snake_case_str(col))]
+    return pd.read_csv(input_path, encoding=encoding, engine="pyarrow", usecols=usecols)
+
+
+def _is_exact_event_column(col: str) -> bool:
+    """Whether ingest_events_exact() uses a (snake_case) column."""
+    return col in _EXACT_EVENT_COLUMNS
+
+
+def _is_recurring_column(col: str) -> bool:
+    """Whether ingest_recurring_event_mapping() uses a (snake_case) column."""
+    return col in _RECURRING_BASE_COLUMNS or _YEAR_COL_RE.match(col) is not None
+
+
+@lru_cache(maxsize=8)
+def _read_events_csv_cached(
+    input_path: str, mtime_ns: int, size: int, keep: Callable[[str], bool] | None
+) -> pd.DataFrame:
+    """Parse an events CSV; cached per (path, modification time, size, column filter)."""
+    df = _read_csv_columns(input_path, _detect_encoding(input_path), keep)
+
+    # Before pandas 3 this engine returns missing strings as None; use NaN like
+    # the default parser so later astype(str) normalization is unchanged
+    obj_cols = [c for c, dtype in df.dtypes.items() if pd.api.types.is_object_dtype(dtype)]
+    if len(obj_cols) > 0:
+        df[obj_cols] = df[obj_cols].fillna(np.nan)
+    return df
+
+
+def _read_events_csv(input_path: str, keep: Callable[[str], bool] | None = None) -> pd.DataFrame:
+    """
+    Read an events CSV with the pyarrow engine.
+
+    The encoding is detected up front (see _detect_encoding), so files are
+    parsed once rather than retried after a failed UTF-8 parse. Parsed frames
+    are cached until the file changes, so re-ingesting an unchanged file (e.g.
+    repeated pipeline runs in one session) skips the parse; callers get a copy.
+
+    Args:
+        input_path: Path to the CSV
+        keep: Optional predicate on the snake_case column name; columns it rejects
+            are never parsed (default: read all columns)
+    """
+    stat = os.stat(input_path)
+    return _read_events_csv_cached(str(input_path), stat.st_mtime_ns, stat.st_size, keep).copy()
+
+
+def _const_col(n: int, value: str = "") -> pd.Categorical:
+    """A length-n column holding one repeated string, sharing a single category."""
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[value])
+
+
+def _sort_codes(values: pd.Series) -> np.ndarray:
+    """
+    Integer codes that sort like values (missing last), from a sorted factorize.
+
+    Sorting on these avoids pairwise Python string comparisons for repeated
+    labels.
+    """
+    codes, uniques = pd.factorize(values, sort=True)
+    return np.where(codes < 0, len(uniques), codes)
+
+
+def _to_categories(df: pd.DataFrame) -> None:
+    """Cast the repeated label columns present in df to the category dtype, in place."""
+    for col in _CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+
+def _write_events_parquet(df: pd.DataFrame, output_path: str) -> None:
+    """
+    Write a (small) events frame to parquet as a single zstd row group.
+
+    The low-cardinality label columns are dictionary encoded.
+    """
+    output_path_obj = Path(output_path)
+    output_path_obj.parent.mkdir(parents=True, exist_ok=True)
+    # Convert to Arrow once and write the table directly
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(
+        table,
+        output_path,
+        compression="zstd",
+        compression_level=1,
+        row_group_size=max(len(df), 1),
+        use_dictionary=[c for c in _DICTIONARY_COLUMNS if c in df.columns],
+    )
 
 
 def ingest_events_exact(
@@ -52,64 +258,64 @@ def ingest_events_exact(
     if output_path is None:
         output_path = "data/processed/events_2026_exact.parquet"
 
-    # Read CSV with encoding handling
-    try:
-        df = pd.read_csv(input_path, encoding="utf-8-sig")
-    except Exception as e:
-        logger.warning(f"UTF-8 encoding failed ({e}), trying latin1")
-        df = pd.read_csv(input_path, encoding="latin1")
+    df = _read_events_csv(input_path, keep=_is_exact_event_column)
 
     # Normalize column names
-    df.columns = [to_snake_case(col) for col in df.columns]
-
-    # Extract required columns
-    df_clean = pd.DataFrame()
+    df.columns = [_snake_case_str(col) for col in df.columns]
+    cols = set(df.columns)
 
     # Event name
-    if "event_name_clean" in df.columns:
-        df_clean["event_name"] = df["event_name_clean"]
-    elif "event_name" in df.columns:
-        df_clean["event_name"] = df["event_name"]
+    if "event_name_clean" in cols:
+        event_name = df["event_name_clean"]
+    elif "event_name" in cols:
+        event_name = df["event_name"]
     else:
         raise ValueError("Could not find event_name column")
 
     # Event name ASCII
-    if "event_name_ascii" in df.columns:
-        df_clean["event_name_ascii"] = df["event_name_ascii"]
+    if "event_name_ascii" in cols:
+        event_name_ascii = df["event_name_ascii"]
     else:
-        df_clean["event_name_ascii"] = df_clean["event_name"].apply(to_ascii)
-
-    # Category and proximity
-    df_clean["category"] = df.get("category", "")
-    df_clean["proximity"] = df.get("proximity", "")
-
-    # Dates
-    df_clean["start_date"] = pd.to_datetime(df["start_date"])
-    df_clean["end_date"] = pd.to_datetime(df["end_date"])
+        event_name_ascii = _to_ascii_series(event_name)
+
+    # Extract required columns in one frame construction (category and
+    # proximity default to "")
+    df_clean = pd.DataFrame(
+        {
+            "event_name": event_name,
+            "event_name_ascii": event_name_ascii,
+            "category": df["category"] if "category" in cols else _const_col(len(df)),
+            "proximity": df["proximity"] if "proximity" in cols else _const_col(len(df)),
+            "start_date": pd.to_datetime(df["start_date"]),
+            "end_date": pd.to_datetime(df["end_date"]),
+        }
+    )
 
     # Validate dates
-    invalid_dates = df_clean["start_date"] > df_clean["end_date"]
+    invalid_dates = df_clean["start_date"].to_numpy() > df_clean["end_date"].to_numpy()
     if invalid_dates.any():
         logger.warning(f"Found {invalid_dates.sum()} rows with start_date > end_date. Fixing...")
         # Swap dates
-        mask = invalid_dates
-        df_clean.loc[mask, ["start_date", "end_date"]] = df_clean.loc[
-            mask, ["end_date", "start_date"]
-        ].values
+        _swap_where(df_clean, "start_date", "end_date", invalid_dates)
 
-    # Remove duplicates
+    # Sort, then remove duplicates on the sorted frame (keeping the first in
+    # sort order), so the deduplicated output is already ordered
     before_dedup = len(df_clean)
-    df_clean = df_clean.drop_duplicates(subset=["event_name_ascii", "start_date", "end_date"])
+    # Sort keys: start_date as int64 (NaT last), then event_name codes
+    start = df_clean["start_date"].to_numpy()
+    start_key = np.where(np.isnat(start), np.iinfo(np.int64).max, start.view("i8"))
+    order = np.lexsort((_sort_codes(df_clean["event_name"]), start_key))
+    df_clean = df_clean.iloc[order]
+    df_clean = df_clean.drop_duplicates(
+        subset=["event_name_ascii", "start_date", "end_date"], ignore_index=True
+    )
     after_dedup = len(df_clean)
     if before_dedup != after_dedup:
         logger.info(f"Removed {before_dedup - after_dedup} duplicate rows")
 
-    # Sort and save
-    df_clean = df_clean.sort_values(["start_date", "event_name"]).reset_index(drop=True)
-
-    output_path_obj = Path(output_path)
-    output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df_clean.to_parquet(output_path, index=False)
+    # Low-cardinality labels as categoricals, then save
+    _to_categories(df_clean)
+    _write_events_parquet(df_clean, output_path)
     logger.info(f"Saved exact events to {output_path} ({len(df_clean)} rows)")
 
     return df_clean
@@ -142,33 +348,27 @@ def ingest_recurring_event_mapping(
     """
     logger.info(f"Reading recurring event mapping from {input_path}")
 
-    # Read CSV
-    try:
-        df = pd.read_csv(input_path, encoding="utf-8-sig")
-    except Exception as e:
-        logger.warning(f"UTF-8 encoding failed ({e}), trying latin1")
-        df = pd.read_csv(input_path, encoding="latin1")
+    # Only parse the base and year columns
+    df = _read_events_csv(input_path, keep=_is_recurring_column)
 
     # Normalize column names
-    df.columns = [to_snake_case(col) for col in df.columns]
+    df.columns = [_snake_case_str(col) for col in df.columns]
+    cols = set(df.columns)
     # Required base columns (only event_family is truly required)
     required = {"event_family"}
-    missing = required - set(df.columns)
+    missing = required - cols
     if missing:
         raise ValueError(f"Recurring mapping missing required columns: {sorted(missing)}")
 
     # Add optional columns if missing
-    if "category" not in df.columns:
-        df["category"] = ""
-    if "proximity" not in df.columns:
-        df["proximity"] = ""
-    if "recurrence_pattern" not in df.columns:
-        df["recurrence_pattern"] = ""
-
-    # Detect year columns via regex: start_YYYY, end_YYYY
-    _YEAR_COL_RE = re.compile(r"^(start|end)_(\d{4})$")
-    year_cols = [c for c in df.columns if _YEAR_COL_RE.match(c)]
-    years = sorted({int(_YEAR_COL_RE.match(c).group(2)) for c in year_cols})
+    for col in ("category", "proximity", "recurrence_pattern"):
+        if col not in cols:
+            df[col] = _const_col(len(df))
+
+    # Detect year columns via regex: start_YYYY, end_YYYY (one match per column)
+    matches = [(c, m) for c in df.columns if (m := _YEAR_COL_RE.match(c))]
+    year_cols = [c for c, _ in matches]
+    years = sorted({int(m.group(2)) for _, m in matches})
 
     if not years:
         raise ValueError(
@@ -176,14 +376,27 @@ def ingest_recurring_event_mapping(
         )
 
     # Validate start/end pairs and parse datetimes
-    for y in years:
-        s = f"start_{y}"
-        e = f"end_{y}"
-        if s not in df.columns or e not in df.columns:
+    start_cols = [f"start_{y}" for y in years]
+    end_cols = [f"end_{y}" for y in years]
+    for s, e in zip(start_cols, end_cols):
+        if s not in cols or e not in cols:
             raise ValueError(f"Recurring mapping missing required pair: {s} and {e}")
-
-        df[s] = pd.to_datetime(df[s], errors="coerce")
-        df[e] = pd.to_datetime(df[e], errors="coerce")
+    for c in start_cols + end_cols:
+        df[c] = pd.to_datetime(df[c], errors="coerce")
+
+    # Check windows for all years at once with one (rows, years) comparison.
+    # Inverted windows are reported but not swapped: in the mapping they come
+    # from a mistyped year (e.g. 2027-12-19 to 2027-01-04), where swapping
+    # would create a year-long event; left as-is they expand to no days.
+    starts = np.column_stack([df[c].to_numpy() for c in start_cols])
+    ends = np.column_stack([df[c].to_numpy() for c in end_cols])
+    invalid_dates = starts > ends
+    if invalid_dates.any():
+        rows, year_idx = np.nonzero(invalid_dates)
+        pairs = ", ".join(
+            f"{df['event_family'].iloc[r]} ({years[j]})" for r, j in zip(rows, year_idx)
+        )
+        logger.warning(f"Found {len(rows)} recurring event windows with start > end: {pairs}")
 
     # Normalize categorical fields
     df["event_family"] = df["event_family"].astype(str).str.strip()
@@ -191,8 +404,8 @@ def ingest_recurring_event_mapping(
     df["recurrence_pattern"] = df["recurrence_pattern"].astype(str).str.strip()
 
     # Create event_family_ascii if missing
-    if "event_family_ascii" not in df.columns:
-        df["event_family_ascii"] = df["event_family"].apply(to_ascii)
+    if "event_family_ascii" not in cols:
+        df["event_family_ascii"] = _to_ascii_series(df["event_family"])
 
     # Select final columns
     base_cols = [
@@ -202,26 +415,44 @@ def ingest_recurring_event_mapping(
         "proximity",
         "recurrence_pattern",
     ]
-    df_clean = df[base_cols + year_cols].copy()
+    df_clean = df[base_cols + year_cols]
 
-    # Remove duplicates
+    # Sort, then remove duplicates on the sorted frame (keeping the first in
+    # sort order), so the deduplicated output is already ordered
     before_dedup = len(df_clean)
-    df_clean = df_clean.drop_duplicates(subset=["event_family_ascii"])
+    df_clean = df_clean.iloc[np.argsort(_sort_codes(df_clean["event_family"]), kind="stable")]
+    df_clean = df_clean.drop_duplicates(subset=["event_family_ascii"], ignore_index=True)
     after_dedup = len(df_clean)
     if before_dedup != after_dedup:
         logger.info(f"Removed {before_dedup - after_dedup} duplicate rows")
 
-    # Sort and save
-    df_clean = df_clean.sort_values("event_family").reset_index(drop=True)
-
-    output_path_obj = Path(output_path)
-    output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df_clean.to_parquet(output_path, index=False)
+    # Low-cardinality labels as categoricals, then save
+    _to_categories(df_clean)
+    _write_events_parquet(df_clean, output_path)
     logger.info(f"Saved recurring event mapping to {output_path} ({len(df_clean)} rows)")
 
     return df_clean
 
 
+def _missing_count(values: pd.Series) -> int:
+    """Number of missing (NaN or empty-string) values, in one pass over the array."""
+    arr = values.to_numpy()
+    return int((pd.isna(arr) | (arr == "")).sum())
+
+
+def _label_counts(values: pd.Series) -> list[tuple]:
+    """
+    (label, count) pairs, most frequent first, like value_counts().
+
+    Counts come from a bincount over factorized codes (the categorical codes
+    for category columns); ties keep first-appearance order.
+    """
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    order = np.argsort(-counts, kind="stable")
+    return list(zip(np.asarray(uniques)[order], counts[order]))
+
+
 def generate_events_audit(
     df_exact: pd.DataFrame,
     df_recurring: pd.DataFrame,
@@ -229,7 +460,9 @@ def generate_events_audit(
 ) -> None:
     """Generate audit report for event data."""
 
-    report = f"""# Events Data Audit
+    # Report sections are collected in a list and joined once at the end
+    parts = [
+        f"""# Events Data Audit
 
 Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
@@ -237,36 +470,38 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
 - **Total Events**: {len(df_exact)}
 - **Date Range**: {df_exact["start_date"].min().strftime("%Y-%m-%d")} to {df_exact["end_date"].max().strftime("%Y-%m-%d")}
-- **Missing Category**: {df_exact["category"].isna().sum() + (df_exact["category"] == "").sum()}
-- **Missing Proximity**: {df_exact["proximity"].isna().sum() + (df_exact["proximity"] == "").sum()}
+- **Missing Category**: {_missing_count(df_exact["category"])}
+- **Missing Proximity**: {_missing_count(df_exact["proximity"])}
 
 ### Category Distribution
 
 """
+    ]
 
-    cat_counts = df_exact["category"].value_counts()
-    for cat, count in cat_counts.head(10).items():
-        report += f"- {cat}: {count}\n"
+    for cat, count in _label_counts(df_exact["category"])[:10]:
+        parts.append(f"- {cat}: {count}\n")
 
-    report += "\n### Proximity Distribution\n\n"
-    prox_counts = df_exact["proximity"].value_counts()
-    for prox, count in prox_counts.items():
-        report += f"- {prox}: {count}\n"
+    parts.append("\n### Proximity Distribution\n\n")
+    for prox, count in _label_counts(df_exact["proximity"]):
+        parts.append(f"- {prox}: {count}\n")
 
-    report += "\n## Recurring Event Mapping\n\n"
-    report += f"- **Total Event Families**: {len(df_recurring)}\n"
-    report += f"- **2025 Date Range**: {df_recurring['start_2025'].min().strftime('%Y-%m-%d')} to {df_recurring['end_2025'].max().strftime('%Y-%m-%d')}\n"
-    report += f"- **2026 Date Range**: {df_recurring['start_2026'].min().strftime('%Y-%m-%d')} to {df_recurring['end_2026'].max().strftime('%Y-%m-%d')}\n"
-    report += f"- **Missing Category**: {df_recurring['category'].isna().sum() + (df_recurring['category'] == '').sum()}\n"
-    report += f"- **Missing Proximity**: {df_recurring['proximity'].isna().sum() + (df_recurring['proximity'] == '').sum()}\n"
+    parts.append("\n## Recurring Event Mapping\n\n")
+    parts.append(f"- **Total Event Families**: {len(df_recurring)}\n")
+    parts.append(
+        f"- **2025 Date Range**: {df_recurring['start_2025'].min().strftime('%Y-%m-%d')} to {df_recurring['end_2025'].max().strftime('%Y-%m-%d')}\n"
+    )
+    parts.append(
+        f"- **2026 Date Range**: {df_recurring['start_2026'].min().strftime('%Y-%m-%d')} to {df_recurring['end_2026'].max().strftime('%Y-%m-%d')}\n"
+    )
+    parts.append(f"- **Missing Category**: {_missing_count(df_recurring['category'])}\n")
+    parts.append(f"- **Missing Proximity**: {_missing_count(df_recurring['proximity'])}\n")
 
-    report += "\n### Category Distribution\n\n"
-    cat_counts_rec = df_recurring["category"].value_counts()
-    for cat, count in cat_counts_rec.items():
-        report += f"- {cat}: {count}\n"
+    parts.append("\n### Category Distribution\n\n")
+    for cat, count in _label_counts(df_recurring["category"]):
+        parts.append(f"- {cat}: {count}\n")
 
     # Save report
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    output_path_obj.write_text(report)
+    output_path_obj.write_text("".join(parts))
     logger.info(f"Saved events audit report to {output_path}")
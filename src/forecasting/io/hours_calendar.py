@@ -4,10 +4,63 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from forecasting.io.parquet import save_parquet
+
 logger = logging.getLogger(__name__)
 
+# Default (open_time, close_time, open_minutes) by day of week, Monday=0
+_WEEK_HOURS = (
+    [("11:00", "20:00", 540)] * 4 + [("10:00", "21:00", 660)] * 2 + [("11:00", "19:00", 480)]
+)
+# December extended hours (Dec 8-30): Mon-Thu open 10:00-21:00
+_DECEMBER_WEEK_HOURS = [("10:00", "21:00", 660)] * 4 + _WEEK_HOURS[4:]
+
+# Keyed by (in December extended period, day of week); row order matches key[0] * 7 + key[1]
+_HOURS_TABLE = {
+    (december, dow): hours
+    for december, week in ((False, _WEEK_HOURS), (True, _DECEMBER_WEEK_HOURS))
+    for dow, hours in enumerate(week)
+}
+_DEFAULT_OPEN = np.array([hours[0] for hours in _HOURS_TABLE.values()], dtype=object)
+_DEFAULT_CLOSE = np.array([hours[1] for hours in _HOURS_TABLE.values()], dtype=object)
+_DEFAULT_MINUTES = np.array([hours[2] for hours in _HOURS_TABLE.values()], dtype=np.int64)
+
+# Persisted dtypes: a handful of distinct HH:MM strings, and minutes within a day
+_HOURS_DTYPES = {
+    "open_time_local": "category",
+    "close_time_local": "category",
+    "open_minutes": "int16",
+    "is_closed": bool,
+}
+
+
+def _read_hours_table(path: str) -> pd.DataFrame:
+    """Read an hours calendar or overrides table from Parquet (by suffix) or CSV."""
+    if Path(path).suffix.lower() == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def _parse_ds(values: pd.Series) -> pd.Series:
+    """Parse a ds column on the ISO-8601 fast path, falling back to format inference."""
+    try:
+        return pd.to_datetime(values, format="ISO8601")
+    except ValueError:
+        return pd.to_datetime(values)
+
+
+def _hm_to_minutes(time_str: str) -> int:
+    """Parse "H:MM"/"HH:MM" to minutes after midnight, accepting what strptime("%H:%M") does."""
+    hours, sep, minutes = time_str.partition(":")
+    if sep and len(hours) <= 2 and len(minutes) <= 2 and hours.isdigit() and minutes.isdigit():
+        hour, minute = int(hours), int(minutes)
+        if hour <= 23 and minute <= 59:
+            return hour * 60 + minute
+    raise ValueError(f"time data {time_str!r} does not match format '%H:%M'")
+
 
 def calculate_open_minutes(open_time_str: str, close_time_str: str) -> int:
     """Calculate open minutes from time strings."""
@@ -15,42 +68,49 @@ def calculate_open_minutes(open_time_str: str, close_time_str: str) -> int:
         return 0
 
     try:
-        open_time = datetime.strptime(open_time_str, "%H:%M").time()
-        close_time = datetime.strptime(close_time_str, "%H:%M").time()
-
-        # Calculate minutes
-        open_mins = open_time.hour * 60 + open_time.minute
-        close_mins = close_time.hour * 60 + close_time.minute
-
-        return close_mins - open_mins
-    except Exception as e:
+        return _hm_to_minutes(close_time_str) - _hm_to_minutes(open_time_str)
+    except (AttributeError, TypeError, ValueError) as e:
         logger.warning(
             f"Failed to calculate open minutes for {open_time_str}-{close_time_str}: {e}"
         )
         return 0
 
 
+def calculate_open_minutes_vec(open_times: pd.Series, close_times: pd.Series) -> pd.Series:
+    """
+    Vectorized calculate_open_minutes over aligned Series of time strings.
+
+    Missing or unparseable times give 0 minutes, as in the scalar version.
+    """
+    open_ts = pd.to_datetime(open_times, format="%H:%M", errors="coerce")
+    close_ts = pd.to_datetime(close_times, format="%H:%M", errors="coerce")
+    minutes = (close_ts - open_ts).dt.total_seconds() // 60
+    return minutes.fillna(0).astype("int32")
+
+
+def _fill_open_minutes(df: pd.DataFrame) -> None:
+    """Fill blank open_minutes in place on rows that give an open time."""
+    if not {"open_time", "close_time", "open_minutes"} <= set(df.columns):
+        return
+    missing = df["open_minutes"].isna() & df["open_time"].notna()
+    if missing.any():
+        df.loc[missing, "open_minutes"] = calculate_open_minutes_vec(
+            df.loc[missing, "open_time"], df.loc[missing, "close_time"]
+        )
+
+
+def _is_december_extended(month, day):
+    """December extended-hours period (Dec 8-30); works on scalars and arrays."""
+    return (month == 12) & (day >= 8) & (day <= 30)
+
+
 def get_default_hours(ds: pd.Timestamp) -> tuple:
     """
     Get default hours for a given date based on day of week.
 
     Returns (open_time, close_time, open_minutes)
     """
-    dow = ds.dayofweek  # Monday=0, Sunday=6
-    month = ds.month
-    day = ds.day
-
-    # December extended hours: Dec 8-30 for Mon-Thu
-    if month == 12 and 8 <= day <= 30 and dow in [0, 1, 2, 3]:  # Mon-Thu
-        return "10:00", "21:00", 660
-
-    # Standard hours by day of week
-    if dow in [0, 1, 2, 3]:  # Mon-Thu
-        return "11:00", "20:00", 540
-    elif dow in [4, 5]:  # Fri-Sat
-        return "10:00", "21:00", 660
-    else:  # Sunday
-        return "11:00", "19:00", 480
+    return _HOURS_TABLE[(bool(_is_december_extended(ds.month, ds.day)), ds.dayofweek)]
 
 
 def build_hours_calendar_forecast(
@@ -66,21 +126,31 @@ def build_hours_calendar_forecast(
     logger.info(f"Building hours calendar forecast from {calendar_path}")
 
     # Read base calendar
-    df_cal = pd.read_csv(calendar_path)
-    df_cal["ds"] = pd.to_datetime(df_cal["ds"])
+    df_cal = _read_hours_table(calendar_path)
+    df_cal["ds"] = _parse_ds(df_cal["ds"])
 
     # Read overrides
-    df_overrides = pd.read_csv(overrides_path)
-    df_overrides["ds"] = pd.to_datetime(df_overrides["ds"])
+    df_overrides = _read_hours_table(overrides_path)
+    df_overrides["ds"] = _parse_ds(df_overrides["ds"])
+
+    # Derive open_minutes left blank next to an open time from the open/close times
+    _fill_open_minutes(df_cal)
+    _fill_open_minutes(df_overrides)
 
     # Apply overrides (override takes precedence)
     df_cal = df_cal.set_index("ds")
     df_overrides = df_overrides.set_index("ds")
 
-    # Update with overrides
-    for col in ["open_time", "close_time", "is_closed", "open_minutes", "notes"]:
-        if col in df_overrides.columns:
-            df_cal[col].update(df_overrides[col])
+    # Update with overrides (non-null override values win; unknown dates are ignored)
+    override_cols = [
+        col
+        for col in ["open_time", "close_time", "is_closed", "open_minutes", "notes"]
+        if col in df_overrides.columns
+    ]
+    if override_cols:
+        df_cal[override_cols] = (
+            df_overrides[override_cols].reindex(df_cal.index).combine_first(df_cal[override_cols])
+        )
 
     df_cal = df_cal.reset_index()
 
@@ -98,10 +168,11 @@ def build_hours_calendar_forecast(
 
     # Sort and save
     df_result = df_result.sort_values("ds").reset_index(drop=True)
+    df_result = df_result.astype(_HOURS_DTYPES)
 
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df_result.to_parquet(output_path, index=False)
+    save_parquet(df_result, output_path)
     logger.info(f"Saved hours calendar forecast to {output_path} ({len(df_result)} rows)")
 
     return df_result
@@ -132,37 +203,30 @@ def build_hours_calendar_history(
     """
     logger.info(f"Building historical hours calendar from {sales_fact_path}")
 
-    # Read sales fact table
-    df_sales = pd.read_parquet(sales_fact_path)
-
-    # Build hours for each date
-    hours_data = []
-    for _, row in df_sales.iterrows():
-        ds = row["ds"]
-
-        # Get default hours
-        open_time, close_time, open_minutes = get_default_hours(ds)
-
-        # Override if sales indicate closed
-        if row["is_closed"]:
-            open_time = None
-            close_time = None
-            open_minutes = 0
-            is_closed = True
-        else:
-            is_closed = False
-
-        hours_data.append(
-            {
-                "ds": ds,
-                "open_time_local": open_time,
-                "close_time_local": close_time,
-                "open_minutes": open_minutes,
-                "is_closed": is_closed,
-            }
-        )
-
-    df_result = pd.DataFrame(hours_data)
+    # Read sales fact table (only the columns used here)
+    df_sales = pd.read_parquet(sales_fact_path, columns=["ds", "is_closed"])
+
+    # Default hours by day of week: one gather from the get_default_hours table
+    ds = df_sales["ds"]
+    december = _is_december_extended(ds.dt.month.to_numpy(), ds.dt.day.to_numpy())
+    key = december * 7 + ds.dt.dayofweek.to_numpy()
+
+    open_time = _DEFAULT_OPEN[key]
+    close_time = _DEFAULT_CLOSE[key]
+    open_minutes = _DEFAULT_MINUTES[key]
+
+    # Override if sales indicate closed
+    is_closed = df_sales["is_closed"].to_numpy(dtype=bool)
+
+    df_result = pd.DataFrame(
+        {
+            "ds": ds.to_numpy(),
+            "open_time_local": np.where(is_closed, None, open_time),
+            "close_time_local": np.where(is_closed, None, close_time),
+            "open_minutes": np.where(is_closed, 0, open_minutes),
+            "is_closed": is_closed,
+        }
+    )
 
     # Validate
     assert (df_result["open_minutes"] >= 0).all(), "Found negative open_minutes"
@@ -170,10 +234,11 @@ def build_hours_calendar_history(
 
     # Sort and save
     df_result = df_result.sort_values("ds").reset_index(drop=True)
+    df_result = df_result.astype(_HOURS_DTYPES)
 
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df_result.to_parquet(output_path, index=False)
+    save_parquet(df_result, output_path)
     logger.info(f"Saved historical hours calendar to {output_path} ({len(df_result)} rows)")
 
     return df_result
@@ -187,16 +252,17 @@ def generate_hours_audit(
     """Generate audit report for hours calendars."""
 
     # Read overrides for reporting
-    df_overrides = pd.read_csv(overrides_path)
-    df_overrides["ds"] = pd.to_datetime(df_overrides["ds"])
+    df_overrides = _read_hours_table(overrides_path)
+    df_overrides["ds"] = _parse_ds(df_overrides["ds"])
 
     # Stats
     closed_count = df_2026["is_closed"].sum()
     min_open = df_2026[df_2026["open_minutes"] > 0]["open_minutes"].min()
     max_open = df_2026["open_minutes"].max()
 
-    # Build report
-    report = f"""# Hours Calendar Audit
+    # Report sections are collected in a list and joined once at the end
+    parts = [
+        f"""# Hours Calendar Audit
 
 Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
@@ -211,23 +277,27 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 ## Closed Days in 2026
 
 """
+    ]
 
     closed_days = df_2026[df_2026["is_closed"]]
-    for _, row in closed_days.iterrows():
-        report += f"- {row['ds'].strftime('%Y-%m-%d')} ({row['ds'].strftime('%A')})\n"
-
-    report += f"\n## Overrides Applied ({len(df_overrides)} total)\n\n"
-    report += "| Date | Day | Open | Close | Minutes | Notes |\n"
-    report += "|------|-----|------|-------|---------|-------|\n"
-
-    for _, row in df_overrides.iterrows():
-        open_time = row["open_time"] if pd.notna(row["open_time"]) else "Closed"
-        close_time = row["close_time"] if pd.notna(row["close_time"]) else ""
-        notes = row["notes"] if pd.notna(row["notes"]) else ""
-        report += f"| {row['ds'].strftime('%Y-%m-%d')} | {row['ds'].strftime('%a')} | {open_time} | {close_time} | {row['open_minutes']} | {notes} |\n"
+    for row in closed_days.itertuples(index=False):
+        parts.append(f"- {row.ds.strftime('%Y-%m-%d')} ({row.ds.strftime('%A')})\n")
+
+    parts.append(f"\n## Overrides Applied ({len(df_overrides)} total)\n\n")
+    parts.append("| Date | Day | Open | Close | Minutes | Notes |\n")
+    parts.append("|------|-----|------|-------|---------|-------|\n")
+
+    for row in df_overrides.itertuples(index=False):
+        open_time = row.open_time if pd.notna(row.open_time) else "Closed"
+        close_time = row.close_time if pd.notna(row.close_time) else ""
+        notes = row.notes if pd.notna(row.notes) else ""
+        parts.append(
+            f"| {row.ds.strftime('%Y-%m-%d')} | {row.ds.strftime('%a')} | {open_time} "
+            f"| {close_time} | {row.open_minutes} | {notes} |\n"
+        )
 
     # Save report
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    output_path_obj.write_text(report)
+    output_path_obj.write_text("".join(parts))
     logger.info(f"Saved hours audit report to {output_path}")
@@ -0,0 +1,46 @@
+"""Shared Parquet (and Feather) I/O for pipeline outputs."""
+
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.feather as feather
+
+# Suffixes written/read as Feather V2 (Arrow IPC) instead of Parquet
+FEATHER_SUFFIXES = {".feather", ".arrow"}
+
+
+def save_parquet(df: pd.DataFrame, path, compression_level: int = 3) -> None:
+    """
+    Write df to Parquet with pyarrow as a single zstd-compressed row group.
+
+    Pipeline outputs are small (hundreds to tens of thousands of rows), so one row group
+    keeps the footer/metadata overhead to a minimum.
+    """
+    df.to_parquet(
+        path,
+        engine="pyarrow",
+        compression="zstd",
+        compression_level=compression_level,
+        row_group_size=max(len(df), 1),
+        index=False,
+    )
+
+
+def save_frame(df: pd.DataFrame, path) -> None:
+    """Write df as lz4 Feather if path has a Feather suffix, else via save_parquet."""
+    if Path(path).suffix in FEATHER_SUFFIXES:
+        feather.write_feather(df.reset_index(drop=True), path, compression="lz4")
+    else:
+        save_parquet(df, path)
+
+
+def read_frame(path) -> pd.DataFrame:
+    """
+    Read a frame written by save_frame, dispatching on the path suffix.
+
+    Feather files are memory-mapped and converted without consolidating blocks.
+    """
+    if Path(path).suffix in FEATHER_SUFFIXES:
+        table = feather.read_table(path, memory_map=True)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    return pd.read_parquet(path)
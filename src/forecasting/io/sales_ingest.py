@@ -1,30 +1,61 @@
 """Sales data ingestion and cleaning."""
 
 import logging
+import re
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from forecasting.io.parquet import save_parquet
+
 logger = logging.getLogger(__name__)
 
+# "$" and "," anywhere plus surrounding whitespace, removed in a single pass
+_SALES_STRIP_RE = r"[$,]|^\s+|\s+$"
+
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_US_DATE_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{4}$")
+
+
+def _infer_date_format(sample: str) -> str | None:
+    """Return an explicit to_datetime format for a sample date string, if recognized."""
+    if _ISO_DATE_RE.match(sample):
+        return "ISO8601"
+    if _US_DATE_RE.match(sample):
+        return "%m/%d/%Y"
+    return None
+
+
+def _read_sales_table(path: str, fast_io: bool = False) -> pd.DataFrame:
+    """Read a raw sales export from Parquet (by suffix) or CSV (pyarrow parser if fast_io)."""
+    if Path(path).suffix.lower() == ".parquet":
+        return pd.read_parquet(path)
+    if fast_io:
+        return pd.read_csv(path, engine="pyarrow")
+    return pd.read_csv(path)
+
 
 def ingest_sales(
     input_path: str = "data/raw/Sales by day.csv",
     output_path: str = "data/processed/fact_sales_daily.parquet",
     closed_threshold: float = 200.0,
+    fast_io: bool = False,
 ) -> pd.DataFrame:
     """
-    Ingest Toast daily sales CSV and produce canonical fact table.
+    Ingest Toast daily sales CSV (or a Parquet copy of it) and produce canonical fact table.
 
     Parameters
     ----------
     input_path : str
-        Path to Toast sales CSV
+        Path to Toast sales CSV, or a .parquet file with the same columns
     output_path : str
         Path to output parquet file
     closed_threshold : float
         Sales threshold below which day is considered closed
+    fast_io : bool
+        Parse the CSV with the multithreaded pyarrow reader instead of the default C parser
 
     Returns
     -------
@@ -33,8 +64,8 @@ def ingest_sales(
     """
     logger.info(f"Reading sales data from {input_path}")
 
-    # Read CSV
-    df = pd.read_csv(input_path)
+    # Read CSV (or Parquet)
+    df = _read_sales_table(input_path, fast_io=fast_io)
 
     # Identify columns (handle various naming conventions)
     date_col = None
@@ -57,15 +88,18 @@ def ingest_sales(
     # Extract and clean
     df_clean = pd.DataFrame()
 
-    # Parse date (handle yyyyMMdd format)
-    if df[date_col].dtype == "int64" or df[date_col].astype(str).str.match(r"^\d{8}$").all():
+    # Parse date (handle yyyyMMdd format; probe the dtype or first non-null value only)
+    non_null = df[date_col].dropna()
+    sample = str(non_null.iloc[0]) if len(non_null) else ""
+
+    if pd.api.types.is_integer_dtype(df[date_col]) or (len(sample) == 8 and sample.isdigit()):
         df_clean["ds"] = pd.to_datetime(df[date_col].astype(str), format="%Y%m%d")
     else:
-        df_clean["ds"] = pd.to_datetime(df[date_col])
+        df_clean["ds"] = pd.to_datetime(df[date_col], format=_infer_date_format(sample))
 
     # Parse sales (handle $ signs, commas)
-    if df[sales_col].dtype == "object":
-        sales_str = df[sales_col].astype(str).str.replace("$", "").str.replace(",", "").str.strip()
+    if not pd.api.types.is_numeric_dtype(df[sales_col]):
+        sales_str = df[sales_col].astype(str).str.replace(_SALES_STRIP_RE, "", regex=True)
         df_clean["y"] = pd.to_numeric(sales_str, errors="coerce")
     else:
         df_clean["y"] = pd.to_numeric(df[sales_col], errors="coerce")
@@ -87,13 +121,14 @@ def ingest_sales(
     df_clean["data_source"] = "toast_export"
     df_clean["notes"] = ""
 
-    # Sort by date
+    # Sort by date; constant metadata is stored as categories
     df_clean = df_clean.sort_values("ds").reset_index(drop=True)
+    df_clean = df_clean.astype({"data_source": "category", "notes": "category"})
 
     # Save to parquet
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df_clean.to_parquet(output_path, index=False)
+    save_parquet(df_clean, output_path)
     logger.info(f"Saved fact table to {output_path}")
 
     return df_clean
@@ -122,12 +157,14 @@ def generate_audit_report(
     top_10 = df.nlargest(10, "y")[["ds", "y"]].copy()
     top_10["ds"] = top_10["ds"].dt.strftime("%Y-%m-%d")
 
-    # Check for missing dates
-    date_range = pd.date_range(start=ds_min, end=ds_max, freq="D")
-    missing_dates = date_range.difference(df["ds"])
+    # Check for missing dates on int64 day numbers (np.isin uses a lookup table for ints)
+    ds_days = df["ds"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    all_days = np.arange(ds_days.min(), ds_days.max() + 1)
+    missing_dates = pd.to_datetime(all_days[~np.isin(all_days, ds_days)], unit="D")
 
-    # Build report
-    report = f"""# Sales Data Audit Summary
+    # Report sections are collected in a list and joined once at the end
+    parts = [
+        f"""# Sales Data Audit Summary
 
 Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
@@ -143,29 +180,31 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 | Date | Net Sales |
 |------|-----------|
 """
+    ]
 
     for _, row in top_10.iterrows():
-        report += f"| {row['ds']} | ${row['y']:,.2f} |\n"
+        parts.append(f"| {row['ds']} | ${row['y']:,.2f} |\n")
 
-    report += "\n## Missing Dates\n\n"
+    parts.append("\n## Missing Dates\n\n")
     if len(missing_dates) > 0:
-        report += f"Found {len(missing_dates)} missing dates in the range:\n\n"
+        parts.append(f"Found {len(missing_dates)} missing dates in the range:\n\n")
         for date in missing_dates[:20]:  # Show first 20
-            report += f"- {date.strftime('%Y-%m-%d')}\n"
+            parts.append(f"- {date.strftime('%Y-%m-%d')}\n")
         if len(missing_dates) > 20:
-            report += f"\n... and {len(missing_dates) - 20} more\n"
+            parts.append(f"\n... and {len(missing_dates) - 20} more\n")
     else:
-        report += "No missing dates found. Data is continuous.\n"
+        parts.append("No missing dates found. Data is continuous.\n")
 
-    report += "\n## Sales Distribution\n\n"
-    report += f"- **Mean**: ${df['y'].mean():,.2f}\n"
-    report += f"- **Median**: ${df['y'].median():,.2f}\n"
-    report += f"- **Min**: ${df['y'].min():,.2f}\n"
-    report += f"- **Max**: ${df['y'].max():,.2f}\n"
-    report += f"- **Std Dev**: ${df['y'].std():,.2f}\n"
+    y_stats = df["y"].agg(["mean", "median", "min", "max", "std"])
+    parts.append("\n## Sales Distribution\n\n")
+    parts.append(f"- **Mean**: ${y_stats['mean']:,.2f}\n")
+    parts.append(f"- **Median**: ${y_stats['median']:,.2f}\n")
+    parts.append(f"- **Min**: ${y_stats['min']:,.2f}\n")
+    parts.append(f"- **Max**: ${y_stats['max']:,.2f}\n")
+    parts.append(f"- **Std Dev**: ${y_stats['std']:,.2f}\n")
 
     # Save report
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-    output_path_obj.write_text(report)
+    output_path_obj.write_text("".join(parts))
     logger.info(f"Saved audit report to {output_path}")
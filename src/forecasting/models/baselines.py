@@ -2,34 +2,54 @@
 
 import logging
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
+def _to_day_numbers(dates) -> np.ndarray:
+    """Convert dates to int64 days since the Unix epoch."""
+    return pd.DatetimeIndex(dates).values.astype("datetime64[D]").astype(np.int64)
+
+
 class SeasonalNaiveWeekly:
     """Seasonal naive baseline using weekly lag (recursive for multi-step)."""
 
     def __init__(self):
-        self.history = None
-        self.forecasts = {}  # Store forecasts for recursive prediction
+        self.y_by_day = {}  # First observed y per history date (days since epoch)
+        self.open_mean = None  # Fallback when neither history nor forecasts cover a lag
+        self._reset_recent()
+
+    def _reset_recent(self):
+        """Clear the ring buffer of recent forecasts used for recursive prediction."""
+        # A weekly lag only ever needs the latest forecast per weekday: slot = day % 7,
+        # tagged with its day number so a stale slot is never mistaken for the lag
+        self._recent_days = [None] * 7
+        self._recent_p50 = [np.nan] * 7
 
     def fit(self, df_sales: pd.DataFrame):
         """
-        Fit the model (just store history).
+        Fit the model (index history for lag lookups; no copy of df_sales is kept).
 
         Parameters
         ----------
         df_sales : pd.DataFrame
             Sales history with ds, y, is_closed
         """
-        self.history = df_sales.copy()
-        self.forecasts = {}
+        self._reset_recent()
+
+        first = df_sales[["ds", "y"]].drop_duplicates("ds")
+        self.y_by_day = dict(zip(_to_day_numbers(first["ds"]).tolist(), first["y"].tolist()))
+        self.open_mean = df_sales.loc[~df_sales["is_closed"], "y"].mean()
 
     def predict(self, target_dates: list) -> pd.DataFrame:
         """
         Predict for target dates.
 
+        Recursion reuses the latest forecast for each weekday, so target_dates (and
+        successive predict calls) are expected in increasing date order.
+
         Parameters
         ----------
         target_dates : list
@@ -40,38 +60,33 @@ class SeasonalNaiveWeekly:
         pd.DataFrame
             Predictions with target_date, p50, p80, p90
         """
-        predictions = []
+        # Recursive loop over plain int day numbers into a preallocated output
+        days = _to_day_numbers(target_dates).tolist()
+        p50s = np.empty(len(days))
+        recent_days, recent_p50 = self._recent_days, self._recent_p50
 
-        for target_date in target_dates:
-            # Look back 7 days
-            lag_date = target_date - pd.Timedelta(days=7)
+        for i, day in enumerate(days):
+            # Look back 7 days (same weekday, so the same ring-buffer slot)
+            lag_day = day - 7
+            slot = day % 7
 
-            # Check if lag_date is in history
-            lag_row = self.history[self.history["ds"] == lag_date]
-
-            if len(lag_row) > 0:
+            if lag_day in self.y_by_day:
                 # Use actual historical value
-                p50 = lag_row.iloc[0]["y"]
-            elif lag_date in self.forecasts:
+                p50 = self.y_by_day[lag_day]
+            elif recent_days[slot] == lag_day:
                 # Use previously forecasted value (recursive)
-                p50 = self.forecasts[lag_date]
+                p50 = recent_p50[slot]
             else:
                 # No data available, use mean
-                p50 = self.history[~self.history["is_closed"]]["y"].mean()
+                p50 = self.open_mean
 
             # Store forecast for future recursive use
-            self.forecasts[target_date] = p50
-
-            predictions.append(
-                {
-                    "target_date": target_date,
-                    "p50": p50,
-                    "p80": p50,  # Simple baseline: use same value
-                    "p90": p50,
-                }
-            )
+            recent_days[slot] = day
+            recent_p50[slot] = p50
+            p50s[i] = p50
 
-        return pd.DataFrame(predictions)
+        # Simple baseline: p80/p90 use same value as p50
+        return pd.DataFrame({"target_date": target_dates, "p50": p50s, "p80": p50s, "p90": p50s})
 
 
 class WeekdayRollingMedian:
@@ -79,18 +94,24 @@ class WeekdayRollingMedian:
 
     def __init__(self, n_weeks: int = 8):
         self.n_weeks = n_weeks
-        self.history = None
+        self.medians = {}  # Recent open-day median per weekday (Monday=0)
+        self.overall_median = None
 
     def fit(self, df_sales: pd.DataFrame):
         """
-        Fit the model (just store history).
+        Fit the model (precompute weekday medians; no copy of df_sales is kept).
 
         Parameters
         ----------
         df_sales : pd.DataFrame
             Sales history with ds, y, is_closed
         """
-        self.history = df_sales.copy()
+        # Median of the last n_weeks open days per weekday, plus the overall fallback
+        open_days = df_sales.loc[~df_sales["is_closed"], ["ds", "y"]]
+        open_days = open_days.sort_values("ds", ascending=False)
+        recent = open_days.groupby(open_days["ds"].dt.dayofweek).head(self.n_weeks)
+        self.medians = recent.groupby(recent["ds"].dt.dayofweek)["y"].median().to_dict()
+        self.overall_median = open_days["y"].median()
 
     def predict(self, target_dates: list) -> pd.DataFrame:
         """
@@ -106,30 +127,7 @@ class WeekdayRollingMedian:
         pd.DataFrame
             Predictions with target_date, p50, p80, p90
         """
-        predictions = []
-
-        for target_date in target_dates:
-            target_dow = target_date.dayofweek
+        # One lookup per date; weekdays with no open history use the overall median
+        p50s = [self.medians.get(d.dayofweek, self.overall_median) for d in target_dates]
 
-            # Get last N same-weekday observations
-            same_dow = self.history[
-                (self.history["ds"].dt.dayofweek == target_dow) & (~self.history["is_closed"])
-            ].sort_values("ds", ascending=False)
-
-            if len(same_dow) > 0:
-                recent = same_dow.head(self.n_weeks)
-                p50 = recent["y"].median()
-            else:
-                # Fallback to overall median
-                p50 = self.history[~self.history["is_closed"]]["y"].median()
-
-            predictions.append(
-                {
-                    "target_date": target_date,
-                    "p50": p50,
-                    "p80": p50,
-                    "p90": p50,
-                }
-            )
-
-        return pd.DataFrame(predictions)
+        return pd.DataFrame({"target_date": target_dates, "p50": p50s, "p80": p50s, "p90": p50s})
@@ -1,21 +1,32 @@
 """Chronos-2 univariate model integration."""
 
+import importlib.util
 import logging
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+from forecasting.backtest.rolling_origin import assign_horizon_buckets
+from forecasting.io.parquet import save_frame
+
 logger = logging.getLogger(__name__)
 
-# Try to import AutoGluon
-try:
-    from autogluon.timeseries import TimeSeriesDataFrame, TimeSeriesPredictor
 
-    CHRONOS_AVAILABLE = True
+def _autogluon_installed() -> bool:
+    """Check for AutoGluon without importing it (the import pulls in torch and friends)."""
+    try:
+        return importlib.util.find_spec("autogluon.timeseries") is not None
+    except ModuleNotFoundError:
+        return False
+
+
+# AutoGluon itself is imported lazily in Chronos2Model.fit
+CHRONOS_AVAILABLE = _autogluon_installed()
+
+if CHRONOS_AVAILABLE:
     logger.info("Chronos-2 (AutoGluon) is available")
-except ImportError:
-    CHRONOS_AVAILABLE = False
+else:
     logger.warning("Chronos-2 (AutoGluon) is NOT available. Skipping Chronos integration.")
 
 
@@ -25,6 +36,7 @@ class Chronos2Model:
     def __init__(self, prediction_length: int = 90, quantiles: list | None = None):
         self.model = None
         self.train_data = None  # Store training data for predictions
+        self._cached_predictions = None  # Full-length forecast, computed once per fit
         self.available = CHRONOS_AVAILABLE
         self.prediction_length = prediction_length
         self.quantiles = quantiles or [0.5, 0.8, 0.9]
@@ -38,24 +50,36 @@ class Chronos2Model:
         df_sales : pd.DataFrame
             Sales history with ds, y, is_closed
         """
+        self._cached_predictions = None
+
         if not self.available:
             logger.warning("Chronos-2 not available, skipping training")
             return
 
+        try:
+            from autogluon.timeseries import TimeSeriesDataFrame, TimeSeriesPredictor
+        except ImportError:
+            logger.exception("Chronos-2 (AutoGluon) failed to import, skipping training")
+            self.available = False
+            return
+
         logger.info("Training Chronos-2 model (univariate)")
 
-        # Prepare data for AutoGluon - use only open days
-        df_train = df_sales[~df_sales["is_closed"]].copy()
-        df_train = df_train.rename(columns={"ds": "timestamp", "y": "target"})
-        df_train["item_id"] = "restaurant"  # Single time series
+        # Prepare data for AutoGluon - use only open days, target column only
+        target = df_sales.loc[~df_sales["is_closed"], ["ds", "y"]].set_index("ds")["y"]
 
         try:
             # Fill missing dates with forward fill to create regular time series
-            # AutoGluon requires regular frequency
-            df_train = df_train.set_index("timestamp")
-            df_train = df_train.asfreq("D", method="ffill")  # Daily frequency, forward fill gaps
-            df_train = df_train.reset_index()
-            df_train["item_id"] = "restaurant"
+            # AutoGluon requires regular frequency; reindexing the one target column onto the
+            # daily range fills only the inserted dates, as asfreq("D", method="ffill") did
+            timestamps = pd.date_range(target.index.min(), target.index.max(), freq="D")
+            df_train = pd.DataFrame(
+                {
+                    "item_id": "restaurant",  # Single time series
+                    "timestamp": timestamps,
+                    "target": target.reindex(timestamps, method="ffill").to_numpy(np.float32),
+                }
+            )
 
             # Create TimeSeriesDataFrame
             ts_df = TimeSeriesDataFrame.from_data_frame(
@@ -75,7 +99,7 @@ class Chronos2Model:
                 prediction_length=self.prediction_length,
                 quantile_levels=self.quantiles,
                 eval_metric="MAPE",
-                verbosity=2,
+                verbosity=0,  # Progress is logged here; AutoGluon's own logging is overhead
             )
 
             self.model.fit(
@@ -116,29 +140,30 @@ class Chronos2Model:
             prediction_length = self.prediction_length
 
         try:
-            # Predict
-            logger.info(f"Generating Chronos-2 predictions for {prediction_length} days")
-            predictions = self.model.predict(data=self.train_data)  # Use stored training data
-
-            # Extract predictions for 'restaurant' item
-            preds_df = predictions.reset_index()
-            preds_df = preds_df[preds_df["item_id"] == "restaurant"].copy()
-
-            # Rename columns
-            preds_df = preds_df.rename(
-                columns={
-                    "timestamp": "target_date",
-                    "0.5": "p50",
-                    "0.8": "p80",
-                    "0.9": "p90",
-                }
-            )
-
-            # Select only needed columns
-            preds_df = preds_df[["target_date", "p50", "p80", "p90"]]
+            # Inputs and horizon are fixed after fit, so inference runs once per fit
+            if self._cached_predictions is None:
+                logger.info(f"Generating Chronos-2 predictions for {prediction_length} days")
+                predictions = self.model.predict(data=self.train_data)  # Use stored training data
+
+                # Extract predictions for 'restaurant' item
+                preds_df = predictions.reset_index()
+                preds_df = preds_df[preds_df["item_id"] == "restaurant"]
+
+                # Rename columns
+                preds_df = preds_df.rename(
+                    columns={
+                        "timestamp": "target_date",
+                        "0.5": "p50",
+                        "0.8": "p80",
+                        "0.9": "p90",
+                    }
+                )
+
+                # Select only needed columns
+                self._cached_predictions = preds_df[["target_date", "p50", "p80", "p90"]]
 
             # Limit to requested prediction length
-            preds_df = preds_df.head(prediction_length)
+            preds_df = self._cached_predictions.head(prediction_length).copy()
 
             logger.info(f"Generated {len(preds_df)} predictions")
 
@@ -193,7 +218,7 @@ def run_chronos2_backtest(
         df_metrics.to_csv(output_metrics_path, index=False)
 
         Path(output_preds_path).parent.mkdir(parents=True, exist_ok=True)
-        df_preds.to_parquet(output_preds_path, index=False)
+        save_frame(df_preds, output_preds_path)
 
         logger.info("Created empty Chronos-2 output files (model unavailable)")
         return None, None
@@ -233,7 +258,7 @@ def run_chronos2_backtest(
         df_metrics.to_csv(output_metrics_path, index=False)
 
         Path(output_preds_path).parent.mkdir(parents=True, exist_ok=True)
-        df_preds.to_parquet(output_preds_path, index=False)
+        save_frame(df_preds, output_preds_path)
 
         return None, None
 
@@ -251,21 +276,7 @@ def run_chronos2_backtest(
     df_preds["horizon"] = (df_preds["target_date"] - df_preds["issue_date"]).dt.days
 
     # Assign horizon buckets
-    def assign_horizon_bucket(h):
-        if 1 <= h <= 7:
-            return "1-7"
-        elif 8 <= h <= 14:
-            return "8-14"
-        elif 15 <= h <= 30:
-            return "15-30"
-        elif 31 <= h <= 90:
-            return "31-90"
-        elif 91 <= h <= 380:
-            return "91-380"
-        else:
-            return "other"
-
-    df_preds["horizon_bucket"] = df_preds["horizon"].apply(assign_horizon_bucket)
+    df_preds["horizon_bucket"] = assign_horizon_buckets(df_preds["horizon"])
 
     # Add actuals (will be NaN for future dates)
     df_preds = df_preds.merge(
@@ -276,7 +287,7 @@ def run_chronos2_backtest(
 
     # Save predictions
     Path(output_preds_path).parent.mkdir(parents=True, exist_ok=True)
-    df_preds.to_parquet(output_preds_path, index=False)
+    save_frame(df_preds, output_preds_path)
     logger.info(f"Saved Chronos-2 predictions to {output_preds_path}")
 
     # Create placeholder metrics (can't compute without actuals for future dates)
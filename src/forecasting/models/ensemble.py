@@ -5,25 +5,62 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from scipy.optimize import minimize
+from scipy.optimize import nnls
 
-logger = logging.getLogger(__name__)
+from forecasting.backtest.rolling_origin import assign_horizon_buckets
+from forecasting.io.parquet import read_frame
 
+logger = logging.getLogger(__name__)
 
-def assign_horizon_bucket(horizon: int) -> str:
-    """Assign horizon to bucket."""
-    if 1 <= horizon <= 7:
-        return "1-7"
-    elif 8 <= horizon <= 14:
-        return "8-14"
-    elif 15 <= horizon <= 30:
-        return "15-30"
-    elif 31 <= horizon <= 90:
-        return "31-90"
-    elif 91 <= horizon <= 380:
-        return "91-380"
-    else:
-        return "other"
+# wMAPE refinement of the NNLS start: pairwise weight transfers, step halved down to this size
+WEIGHT_TOLERANCE = 1e-3
+
+
+def _project_to_simplex(v: np.ndarray) -> np.ndarray:
+    """Euclidean projection onto the probability simplex (sort-based, Duchi et al. 2008)."""
+    u = np.sort(v)[::-1]
+    cumsum = np.cumsum(u)
+    k = np.arange(1, len(v) + 1)
+    rho = np.nonzero(u * k > cumsum - 1)[0][-1]
+    theta = (cumsum[rho] - 1) / (rho + 1)
+    return np.maximum(v - theta, 0.0)
+
+
+def _fit_simplex_weights(X: np.ndarray, y_true: np.ndarray) -> np.ndarray:
+    """
+    Find simplex weights (non-negative, summing to 1) minimizing wMAPE of X @ w against y_true.
+
+    Starts from the non-negative least-squares solution projected onto the simplex, then
+    refines it for absolute error by moving weight between pairs of models, halving the
+    step until it drops below WEIGHT_TOLERANCE. Moving weight a from model i to model j
+    shifts the residual by a * (X[:, j] - X[:, i]), so every round scores all moves from
+    the current residual and precomputed column differences, without re-multiplying X.
+    """
+    best = _project_to_simplex(nnls(X, y_true)[0])
+    residual = X @ best - y_true
+    best_error = np.abs(residual).sum()
+
+    # Ordered model pairs (src -> dst) and the residual shift per unit of weight moved
+    src, dst = np.nonzero(~np.eye(X.shape[1], dtype=bool))
+    shifts = X[:, dst] - X[:, src]
+
+    step = 1 / 16
+    while step >= WEIGHT_TOLERANCE and len(src):
+        # A model can give away at most the weight it has
+        amounts = np.minimum(best[src], step)
+        errors = shifts * amounts
+        errors += residual[:, None]
+        np.abs(errors, out=errors)
+        errors = errors.sum(axis=0)
+        k = np.argmin(errors)
+        if amounts[k] > 0 and errors[k] < best_error:
+            best[src[k]] -= amounts[k]
+            best[dst[k]] += amounts[k]
+            residual += amounts[k] * shifts[:, k]
+            best_error = errors[k]
+        else:
+            step /= 2
+    return best
 
 
 class EnsembleModel:
@@ -40,21 +77,24 @@ class EnsembleModel:
         Parameters
         ----------
         backtest_preds_paths : dict
-            Dictionary of model_name -> parquet path
+            Dictionary of model_name -> Parquet or Feather path
         min_rows : int
             Minimum rows required to fit weights
         """
         logger.info("Fitting ensemble weights from backtest predictions")
 
-        # Load all backtest predictions
+        # Load all backtest predictions (files shared by several models are read once)
         all_preds = []
+        frames_by_path = {}
 
         for model_name, path in backtest_preds_paths.items():
             if not Path(path).exists():
                 logger.warning(f"Backtest predictions not found: {path}")
                 continue
 
-            df = pd.read_parquet(path)
+            if path not in frames_by_path:
+                frames_by_path[path] = read_frame(path)
+            df = frames_by_path[path]
 
             if len(df) == 0:
                 logger.warning(f"Empty backtest predictions: {model_name}")
@@ -106,25 +146,17 @@ class EnsembleModel:
                     )
                 continue
 
-            # Pivot to get predictions per model
-            df_pivot = df_bucket.pivot_table(
-                index=["cutoff_date", "target_date"],
-                columns="model_name",
-                values="p50",
-                aggfunc="first",
-            ).reset_index()
-
-            # Get actuals
-            df_pivot = df_pivot.merge(
-                df_bucket[["cutoff_date", "target_date", "y"]].drop_duplicates(),
-                on=["cutoff_date", "target_date"],
-                how="left",
-            )
-
-            # Drop rows with missing data
-            df_pivot = df_pivot.dropna()
-
-            if len(df_pivot) < min_rows:
+            # p50 per (cutoff_date, target_date) x model (first non-null, models with no
+            # predictions dropped) and actuals aligned on the same index
+            keys = ["cutoff_date", "target_date"]
+            df_x = df_bucket.groupby([*keys, "model_name"])["p50"].first().unstack("model_name")
+            df_x = df_x.dropna(axis=1, how="all")
+            y = df_bucket.groupby(keys)["y"].first().reindex(df_x.index)
+
+            # Keep rows with every model and the actual present
+            complete = (df_x.notna().all(axis=1) & y.notna()).to_numpy()
+
+            if complete.sum() < min_rows:
                 logger.warning(
                     f"Insufficient complete data for bucket {bucket}, using equal weights"
                 )
@@ -132,7 +164,7 @@ class EnsembleModel:
                 continue
 
             # Get models available in this bucket
-            bucket_models = [m for m in self.models if m in df_pivot.columns]
+            bucket_models = [m for m in self.models if m in df_x.columns]
 
             if len(bucket_models) == 0:
                 logger.warning(f"No models available for bucket {bucket}, using equal weights")
@@ -140,38 +172,18 @@ class EnsembleModel:
                 continue
 
             # Optimize weights
-            y_true = df_pivot["y"].values
-            X = df_pivot[bucket_models].values
-
-            def objective(w):
-                """Minimize wMAPE."""
-                y_pred = X @ w
-                wmape = np.abs(y_pred - y_true).sum() / y_true.sum()
-                return wmape
+            y_true = y.to_numpy()[complete]
+            X = df_x[bucket_models].to_numpy()[complete]
 
-            # Initial guess: equal weights
-            w0 = np.ones(len(bucket_models)) / len(bucket_models)
+            # Weights on the simplex (non-negative, sum to 1) minimizing wMAPE
+            weights_opt = _fit_simplex_weights(X, y_true)
+            wmape = np.abs(X @ weights_opt - y_true).sum() / y_true.sum()
 
-            # Constraints: weights sum to 1
-            constraints = {"type": "eq", "fun": lambda w: w.sum() - 1}
-
-            # Bounds: weights in [0, 1]
-            bounds = [(0, 1) for _ in bucket_models]
-
-            result = minimize(objective, w0, method="SLSQP", bounds=bounds, constraints=constraints)
-
-            if result.success:
-                weights_opt = result.x
-                # Set weights for bucket models, 0 for others
-                self.weights[bucket] = {m: 0.0 for m in self.models}
-                for m, w in zip(bucket_models, weights_opt):
-                    self.weights[bucket][m] = w
-                logger.info(f"Bucket {bucket}: weights = {self.weights[bucket]}")
-            else:
-                logger.warning(f"Optimization failed for bucket {bucket}, using equal weights")
-                self.weights[bucket] = {
-                    m: 1.0 / len(bucket_models) if m in bucket_models else 0.0 for m in self.models
-                }
+            # Set weights for bucket models, 0 for others
+            self.weights[bucket] = {m: 0.0 for m in self.models}
+            for m, w in zip(bucket_models, weights_opt):
+                self.weights[bucket][m] = float(w)
+            logger.info(f"Bucket {bucket}: weights = {self.weights[bucket]} (wMAPE {wmape:.4f})")
 
     def predict(self, model_predictions: dict) -> pd.DataFrame:
         """
@@ -206,50 +218,48 @@ class EnsembleModel:
         df_all = pd.concat(all_preds, ignore_index=True)
 
         # Assign horizon buckets
-        df_all["horizon_bucket"] = df_all["horizon"].apply(assign_horizon_bucket)
-
-        # Ensemble per date
-        ensemble_preds = []
-
-        for target_date in df_all["target_date"].unique():
-            df_date = df_all[df_all["target_date"] == target_date]
-
-            if len(df_date) == 0:
-                continue
-
-            # Get horizon bucket
-            bucket = df_date["horizon_bucket"].iloc[0]
-
-            # Get weights for this bucket
-            weights = self.weights.get(bucket, {m: 1.0 / len(self.models) for m in self.models})
-
-            # Blend predictions
-            # - Aggregate duplicates (defensive)
-            # - Renormalize weights over models that are actually present for this target_date
-            df_models = df_date.groupby("model_name", as_index=False)[["p50", "p80", "p90"]].mean()
-            available_models = df_models["model_name"].tolist()
-
-            raw_w = np.array([weights.get(m, 0.0) for m in available_models], dtype=float)
-            if raw_w.sum() <= 0:
-                # Fallback: equal weights across available models
-                norm_w = np.ones(len(available_models), dtype=float) / max(1, len(available_models))
-            else:
-                norm_w = raw_w / raw_w.sum()
-
-            p50_blend = float((df_models["p50"].values * norm_w).sum())
-            p80_blend = float((df_models["p80"].values * norm_w).sum())
-            p90_blend = float((df_models["p90"].values * norm_w).sum())
-
-            ensemble_preds.append(
-                {
-                    "target_date": target_date,
-                    "p50": p50_blend,
-                    "p80": p80_blend,
-                    "p90": p90_blend,
-                }
-            )
-
-        df_ensemble = pd.DataFrame(ensemble_preds)
+        df_all["horizon_bucket"] = assign_horizon_buckets(df_all["horizon"])
+
+        # Mean prediction per (target_date, model_name) as dense (dates x models) matrices
+        # (duplicates aggregated defensively); dates keep their order of first appearance
+        grouped = df_all.groupby(["target_date", "model_name"])[["p50", "p80", "p90"]]
+        df_models = grouped.mean().unstack("model_name")
+        present = grouped.size().unstack("model_name").notna()
+        dates = df_all["target_date"].drop_duplicates()
+        dates = dates[dates.isin(present.index)]
+        df_models = df_models.reindex(dates)
+        model_names = df_models["p50"].columns
+        present = present.reindex(index=dates, columns=model_names).to_numpy()
+
+        # Weight matrix: each date takes the weights of its first row's horizon bucket
+        equal = {m: 1.0 / len(self.models) for m in self.models}
+        date_buckets = df_all.drop_duplicates("target_date").set_index("target_date")
+        buckets = date_buckets["horizon_bucket"].reindex(dates).to_numpy()
+        bucket_names, bucket_idx = np.unique(buckets, return_inverse=True)
+        bucket_w = np.array(
+            [[self.weights.get(b, equal).get(m, 0.0) for m in model_names] for b in bucket_names],
+            dtype=float,
+        ).reshape(len(bucket_names), len(model_names))
+
+        # Renormalize weights over models that are actually present for each target_date
+        # (equal weights across them if none of their weights is positive)
+        raw_w = np.where(present, bucket_w[bucket_idx], 0.0)
+        raw_sum = raw_w.sum(axis=1, keepdims=True)
+        equal_w = present / present.sum(axis=1, keepdims=True)
+        norm_w = np.where(raw_sum <= 0, equal_w, raw_w / np.where(raw_sum > 0, raw_sum, 1.0))
+
+        blends = {
+            q: np.where(present, df_models[q].to_numpy(dtype=float), 0.0) * norm_w
+            for q in ["p50", "p80", "p90"]
+        }
+        df_ensemble = pd.DataFrame(
+            {
+                "target_date": dates.to_numpy(),
+                "p50": blends["p50"].sum(axis=1),
+                "p80": blends["p80"].sum(axis=1),
+                "p90": blends["p90"].sum(axis=1),
+            }
+        )
 
         return df_ensemble
 
@@ -5,9 +5,13 @@ import pickle
 from pathlib import Path
 
 import lightgbm as lgb
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 
+from forecasting.backtest.rolling_origin import assign_horizon_buckets, compute_metrics
 from forecasting.features.feature_builders import build_features_long
+from forecasting.io.parquet import save_frame
 
 logger = logging.getLogger(__name__)
 
@@ -49,9 +53,15 @@ class GBMLongHorizon:
         logger.info(f"Training GBM long-horizon with {len(self.feature_cols)} features")
         logger.info(f"Training samples: {len(df_train)}")
 
-        X_train = df_train[self.feature_cols].fillna(0)
+        # Column-major float64 matrix: LightGBM bins it feature by feature without a copy
+        X_train = np.asfortranarray(df_train[self.feature_cols].to_numpy(np.float64, na_value=0.0))
         y_train = df_train["y"].values
 
+        # Bin the features once; every quantile model trains on the same Dataset
+        train_data = lgb.Dataset(
+            X_train, label=y_train, feature_name=self.feature_cols, params={"verbose": -1}
+        ).construct()
+
         # Train one model per quantile
         for q in self.quantiles:
             logger.info(f"Training quantile {q}...")
@@ -65,11 +75,11 @@ class GBMLongHorizon:
                 "feature_fraction": 0.8,
                 "bagging_fraction": 0.8,
                 "bagging_freq": 5,
+                "force_col_wise": True,
+                "deterministic": True,
                 "verbose": -1,
             }
 
-            train_data = lgb.Dataset(X_train, label=y_train)
-
             model = lgb.train(
                 params,
                 train_data,
@@ -96,12 +106,14 @@ class GBMLongHorizon:
         pd.DataFrame
             Predictions with target_date, p50, p80, p90
         """
-        # Add missing columns with 0
-        for col in self.feature_cols:
-            if col not in df_features.columns:
-                df_features[col] = 0
-
-        X_pred = df_features[self.feature_cols].fillna(0)
+        # Feature matrix in training column order; missing columns and NaNs become 0.
+        # Made row-major once: LightGBM flattens its input per call, so a column-major
+        # matrix would be copied again for every quantile
+        X_pred = np.ascontiguousarray(
+            df_features.reindex(columns=self.feature_cols, fill_value=0).to_numpy(
+                np.float64, na_value=0.0
+            )
+        )
 
         predictions = df_features[["target_date"]].copy()
 
@@ -139,6 +151,117 @@ class GBMLongHorizon:
         return model
 
 
+def _run_one_cutoff(
+    cutoff_date: pd.Timestamp,
+    df_train_full: pd.DataFrame,
+    df_sales: pd.DataFrame,
+    df_hours: pd.DataFrame,
+    df_events: pd.DataFrame,
+    ds_max: pd.Timestamp,
+    max_horizon: int,
+) -> pd.DataFrame | None:
+    """
+    Train on data up to one cutoff and predict H=15..max_horizon; None if skipped.
+
+    df_train_full must be sorted by issue_date.
+    """
+    logger.info(f"Cutoff: {cutoff_date}")
+
+    # Train data: issue_date <= cutoff (a prefix of the issue_date-sorted frame)
+    # AND target_date <= cutoff
+    df_train = df_train_full.iloc[: df_train_full["issue_date"].searchsorted(cutoff_date, "right")]
+    df_train = df_train[df_train["target_date"] <= cutoff_date]
+
+    if len(df_train) < 500:
+        logger.warning(f"Insufficient training data at cutoff {cutoff_date}")
+        return None
+
+    # Train model
+    model = GBMLongHorizon()
+    model.fit(df_train)
+
+    # Eval horizon
+    h_eval = min(max_horizon, (ds_max - cutoff_date).days)
+
+    if h_eval < 15:
+        return None
+
+    # Predict for H=15 to H_eval
+    target_dates = pd.date_range(
+        start=cutoff_date + pd.Timedelta(days=15),
+        end=cutoff_date + pd.Timedelta(days=h_eval),
+        freq="D",
+    )
+
+    # Filter to dates that exist in sales
+    target_dates = target_dates[target_dates.isin(df_sales["ds"])].tolist()
+
+    if len(target_dates) == 0:
+        return None
+
+    # Build features
+    df_features = build_features_long(
+        issue_date=cutoff_date,
+        target_dates=target_dates,
+        df_hours=df_hours,
+        df_events=df_events,
+    )
+
+    # Predict
+    preds = model.predict(df_features)
+    preds["cutoff_date"] = cutoff_date
+    preds["issue_date"] = cutoff_date
+    preds["model_name"] = "gbm_long"
+
+    # Add labels
+    preds = preds.merge(
+        df_sales[["ds", "y", "is_closed"]].rename(columns={"ds": "target_date"}),
+        on="target_date",
+        how="left",
+    )
+
+    # Add horizon and bucket
+    preds["horizon"] = (preds["target_date"] - preds["issue_date"]).dt.days
+
+    preds["horizon_bucket"] = assign_horizon_buckets(preds["horizon"])
+
+    return preds
+
+
+class _RecordCollector(logging.Handler):
+    """Collect log records (made picklable) so a worker can hand them back to the parent."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.getMessage(), None, None
+        self.records.append(record)
+
+
+def _run_one_cutoff_logged(log_level: int, *args) -> tuple:
+    """
+    Run _run_one_cutoff, capturing the package's log records instead of emitting them.
+
+    Loky workers do not inherit the parent's logging setup, so records are returned with the
+    predictions and replayed by the parent. Returns (preds or None, records).
+    """
+    package_logger = logging.getLogger("forecasting")
+    collector = _RecordCollector()
+    saved = package_logger.level, package_logger.propagate
+    package_logger.addHandler(collector)
+    package_logger.setLevel(log_level)
+    package_logger.propagate = False
+    try:
+        return _run_one_cutoff(*args), collector.records
+    finally:
+        package_logger.removeHandler(collector)
+        package_logger.level, package_logger.propagate = saved
+
+
 def run_gbm_long_backtest(
     train_data_path: str = "data/processed/train_long.parquet",
     sales_fact_path: str = "data/processed/fact_sales_daily.parquet",
@@ -149,13 +272,23 @@ def run_gbm_long_backtest(
     min_train_days: int = 120,
     step_days: int = 28,  # Use larger step for long horizon
     max_horizon: int = 380,
+    n_jobs: int = -1,
 ) -> tuple:
-    """Run rolling-origin backtest for GBM long-horizon model."""
+    """
+    Run rolling-origin backtest for GBM long-horizon model.
+
+    Cutoffs are trained in parallel across ``n_jobs`` loky workers (-1 = all cores);
+    ``n_jobs=1`` runs them serially in this process, as before. Worker log messages are
+    replayed here in cutoff order once all cutoffs finish.
+    """
 
     logger.info("Running GBM long-horizon backtest")
 
     # Load data
     df_train_full = pd.read_parquet(train_data_path)
+    # Sorted once so each cutoff takes its issue_date prefix by binary search (stable sort keeps
+    # the row order of datasets already written in issue_date order)
+    df_train_full = df_train_full.sort_values("issue_date", kind="stable", ignore_index=True)
     df_sales = pd.read_parquet(sales_fact_path)
     df_hours = pd.read_parquet(hours_history_path)
     df_events = pd.read_parquet(events_history_path)
@@ -171,81 +304,28 @@ def run_gbm_long_backtest(
 
     logger.info(f"Running backtest with {len(cutoff_dates)} cutoffs")
 
-    all_preds = []
-
-    for cutoff_date in cutoff_dates:
-        logger.info(f"Cutoff: {cutoff_date}")
-
-        # Train data: issue_date <= cutoff AND target_date <= cutoff
-        df_train = df_train_full[
-            (df_train_full["issue_date"] <= cutoff_date)
-            & (df_train_full["target_date"] <= cutoff_date)
-        ]
-
-        if len(df_train) < 500:
-            logger.warning(f"Insufficient training data at cutoff {cutoff_date}")
-            continue
-
-        # Train model
-        model = GBMLongHorizon()
-        model.fit(df_train)
-
-        # Eval horizon
-        h_eval = min(max_horizon, (ds_max - cutoff_date).days)
-
-        if h_eval < 15:
-            continue
-
-        # Predict for H=15 to H_eval
-        target_dates = pd.date_range(
-            start=cutoff_date + pd.Timedelta(days=15),
-            end=cutoff_date + pd.Timedelta(days=h_eval),
-            freq="D",
-        ).tolist()
-
-        # Filter to dates that exist in sales
-        target_dates = [d for d in target_dates if d in df_sales["ds"].values]
-
-        if len(target_dates) == 0:
-            continue
-
-        # Build features
-        df_features = build_features_long(
-            issue_date=cutoff_date,
-            target_dates=target_dates,
-            df_hours=df_hours,
-            df_events=df_events,
-        )
-
-        # Predict
-        preds = model.predict(df_features)
-        preds["cutoff_date"] = cutoff_date
-        preds["issue_date"] = cutoff_date
-        preds["model_name"] = "gbm_long"
-
-        # Add labels
-        preds = preds.merge(
-            df_sales[["ds", "y", "is_closed"]].rename(columns={"ds": "target_date"}),
-            on="target_date",
-            how="left",
+    # Cutoffs are independent: train and predict each in its own worker, then replay each
+    # worker's log records here in cutoff order
+    log_level = logging.getLogger("forecasting").getEffectiveLevel()
+    results = Parallel(n_jobs=n_jobs, backend="loky", batch_size=1, max_nbytes="50M")(
+        delayed(_run_one_cutoff_logged)(
+            log_level,
+            cutoff_date,
+            df_train_full,
+            df_sales,
+            df_hours,
+            df_events,
+            ds_max,
+            max_horizon,
         )
-
-        # Add horizon and bucket
-        preds["horizon"] = (preds["target_date"] - preds["issue_date"]).dt.days
-
-        def assign_bucket(h):
-            if 15 <= h <= 30:
-                return "15-30"
-            elif 31 <= h <= 90:
-                return "31-90"
-            elif 91 <= h <= 380:
-                return "91-380"
-            else:
-                return "other"
-
-        preds["horizon_bucket"] = preds["horizon"].apply(assign_bucket)
-
-        all_preds.append(preds)
+        for cutoff_date in cutoff_dates
+    )
+    all_preds = []
+    for preds, records in results:
+        for record in records:
+            logging.getLogger(record.name).handle(record)
+        if preds is not None:
+            all_preds.append(preds)
 
     # Combine predictions
     df_preds = pd.concat(all_preds, ignore_index=True)
@@ -253,8 +333,6 @@ def run_gbm_long_backtest(
     logger.info(f"Total predictions: {len(df_preds)}")
 
     # Compute metrics
-    from forecasting.backtest.rolling_origin import compute_metrics
-
     df_metrics = compute_metrics(df_preds)
     df_metrics["model_name"] = "gbm_long"
 
@@ -264,7 +342,7 @@ def run_gbm_long_backtest(
     logger.info(f"Saved metrics to {output_metrics_path}")
 
     Path(output_preds_path).parent.mkdir(parents=True, exist_ok=True)
-    df_preds.to_parquet(output_preds_path, index=False)
+    save_frame(df_preds, output_preds_path)
     logger.info(f"Saved predictions to {output_preds_path}")
 
     return df_metrics, df_preds
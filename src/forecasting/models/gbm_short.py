@@ -5,9 +5,11 @@ import pickle
 from pathlib import Path
 
 import lightgbm as lgb
+import numpy as np
 import pandas as pd
 
 from forecasting.features.feature_builders import build_features_short
+from forecasting.io.parquet import save_frame
 
 logger = logging.getLogger(__name__)
 
@@ -44,9 +46,15 @@ class GBMShortHorizon:
         logger.info(f"Training GBM short-horizon with {len(self.feature_cols)} features")
         logger.info(f"Training samples: {len(df_train)}")
 
-        X_train = df_train[self.feature_cols].fillna(0)
+        # Column-major float64 matrix: LightGBM bins it feature by feature without a copy
+        X_train = np.asfortranarray(df_train[self.feature_cols].to_numpy(np.float64, na_value=0.0))
         y_train = df_train["y"].values
 
+        # Bin the features once; every quantile model trains on the same Dataset
+        train_data = lgb.Dataset(
+            X_train, label=y_train, feature_name=self.feature_cols, params={"verbose": -1}
+        ).construct()
+
         # Train one model per quantile
         for q in self.quantiles:
             logger.info(f"Training quantile {q}...")
@@ -60,11 +68,11 @@ class GBMShortHorizon:
                 "feature_fraction": 0.8,
                 "bagging_fraction": 0.8,
                 "bagging_freq": 5,
+                "force_col_wise": True,
+                "deterministic": True,
                 "verbose": -1,
             }
 
-            train_data = lgb.Dataset(X_train, label=y_train)
-
             model = lgb.train(
                 params,
                 train_data,
@@ -91,12 +99,14 @@ class GBMShortHorizon:
         pd.DataFrame
             Predictions with target_date, p50, p80, p90
         """
-        # Add missing columns with 0
-        for col in self.feature_cols:
-            if col not in df_features.columns:
-                df_features[col] = 0
-
-        X_pred = df_features[self.feature_cols].fillna(0)
+        # Feature matrix in training column order; missing columns and NaNs become 0.
+        # Made row-major once: LightGBM flattens its input per call, so a column-major
+        # matrix would be copied again for every quantile
+        X_pred = np.ascontiguousarray(
+            df_features.reindex(columns=self.feature_cols, fill_value=0).to_numpy(
+                np.float64, na_value=0.0
+            )
+        )
 
         predictions = df_features[["target_date"]].copy()
 
@@ -189,10 +199,10 @@ def run_gbm_short_backtest(
             start=cutoff_date + pd.Timedelta(days=1),
             end=cutoff_date + pd.Timedelta(days=14),
             freq="D",
-        ).tolist()
+        )
 
         # Filter to dates that exist in sales
-        target_dates = [d for d in target_dates if d in df_sales["ds"].values]
+        target_dates = target_dates[target_dates.isin(df_sales["ds"])].tolist()
 
         if len(target_dates) == 0:
             continue
@@ -221,7 +231,7 @@ def run_gbm_short_backtest(
 
         # Add horizon and bucket
         preds["horizon"] = (preds["target_date"] - preds["issue_date"]).dt.days
-        preds["horizon_bucket"] = preds["horizon"].apply(lambda h: "1-7" if h <= 7 else "8-14")
+        preds["horizon_bucket"] = np.where(preds["horizon"] <= 7, "1-7", "8-14")
 
         all_preds.append(preds)
 
@@ -242,7 +252,7 @@ def run_gbm_short_backtest(
     logger.info(f"Saved metrics to {output_metrics_path}")
 
     Path(output_preds_path).parent.mkdir(parents=True, exist_ok=True)
-    df_preds.to_parquet(output_preds_path, index=False)
+    save_frame(df_preds, output_preds_path)
     logger.info(f"Saved predictions to {output_preds_path}")
 
     return df_metrics, df_preds
@@ -21,6 +21,7 @@ from forecasting.io.hours_calendar import (
 )
 
 # Import all pipeline components
+from forecasting.io.parquet import read_frame, save_parquet
 from forecasting.io.sales_ingest import ingest_sales
 from forecasting.models.chronos2 import run_chronos2_backtest
 from forecasting.models.ensemble import EnsembleModel
@@ -204,7 +205,7 @@ def run_pipeline(
             df_sales = pd.read_parquet("data/processed/fact_sales_daily.parquet")
             ds_max = df_sales["ds"].max().strftime("%Y-%m-%d")
             df_uplift = compute_event_uplift_priors(ds_max=ds_max)
-            df_uplift.to_parquet("data/processed/event_uplift_priors.parquet", index=False)
+            save_parquet(df_uplift, "data/processed/event_uplift_priors.parquet")
             generate_uplift_report(df_uplift)
         else:
             logger.info("\n[5/9] Skipping event uplift priors recompute (using existing priors)")
@@ -301,7 +302,7 @@ def run_pipeline(
                 import pandas as pd
 
                 from forecasting.backtest.rolling_origin import (
-                    assign_horizon_bucket,
+                    assign_horizon_buckets,
                     compute_metrics,
                 )
 
@@ -321,10 +322,13 @@ def run_pipeline(
                 }
 
                 frames = []
+                frames_by_path = {}
                 for model_name, path in backtest_preds_paths.items():
                     if not Path(path).exists():
                         continue
-                    df = pd.read_parquet(path)
+                    if path not in frames_by_path:
+                        frames_by_path[path] = read_frame(path)
+                    df = frames_by_path[path]
                     if len(df) == 0:
                         continue
                     if "model_name" in df.columns:
@@ -338,7 +342,7 @@ def run_pipeline(
 
                 df_all = pd.concat(frames, ignore_index=True)
                 if "horizon_bucket" not in df_all.columns:
-                    df_all["horizon_bucket"] = df_all["horizon"].apply(assign_horizon_bucket)
+                    df_all["horizon_bucket"] = assign_horizon_buckets(df_all["horizon"])
 
                 # Blend p50 per (cutoff_date, target_date) within each bucket
                 ens_rows = []
@@ -0,0 +1,15 @@
+"""Test chronos2 module import does not load AutoGluon."""
+
+import importlib
+import sys
+
+
+def test_chronos2_import_does_not_load_autogluon():
+    """Test AutoGluon is only probed at import time, not imported."""
+    sys.modules.pop("forecasting.models.chronos2", None)
+    already_loaded = "autogluon.timeseries" in sys.modules
+
+    chronos2 = importlib.import_module("forecasting.models.chronos2")
+
+    assert isinstance(chronos2.CHRONOS_AVAILABLE, bool)
+    assert ("autogluon.timeseries" in sys.modules) == already_loaded
@@ -0,0 +1,35 @@
+"""Test Chronos-2 predictions are computed once per fit."""
+
+import pandas as pd
+
+from forecasting.models.chronos2 import Chronos2Model
+
+
+class _CountingPredictor:
+    """Stand-in for a fitted TimeSeriesPredictor that counts predict calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, data):
+        self.calls += 1
+        index = pd.MultiIndex.from_product(
+            [["restaurant"], pd.date_range("2026-01-01", periods=5)],
+            names=["item_id", "timestamp"],
+        )
+        return pd.DataFrame({"0.5": 1.0, "0.8": 2.0, "0.9": 3.0}, index=index)
+
+
+def test_predict_reuses_cached_forecast():
+    """Test repeated predict calls run inference once and slice the cached forecast."""
+    model = Chronos2Model(prediction_length=5)
+    model.available = True
+    model.model = _CountingPredictor()
+
+    first = model.predict()
+    second = model.predict(prediction_length=3)
+
+    assert model.model.calls == 1
+    assert len(first) == 5
+    assert second["target_date"].tolist() == first["target_date"].head(3).tolist()
+    assert list(second.columns) == ["target_date", "p50", "p80", "p90"]
@@ -0,0 +1,26 @@
+"""Test Parquet/Feather output helpers."""
+
+import pandas as pd
+import pytest
+
+from forecasting.io.parquet import read_frame, save_frame
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+def test_save_frame_round_trips_by_suffix(tmp_path, suffix):
+    """Test save_frame/read_frame round-trip predictions in the format the suffix selects."""
+    df = pd.DataFrame(
+        {
+            "target_date": pd.date_range("2026-01-01", periods=3),
+            "model_name": ["gbm_long"] * 3,
+            "p50": [1.0, 2.5, 3.0],
+            "horizon": [15, 16, 17],
+        }
+    )
+    path = tmp_path / f"preds{suffix}"
+
+    save_frame(df, path)
+
+    pd.testing.assert_frame_equal(read_frame(path), df, check_dtype=False)
+    if suffix == ".feather":
+        assert path.read_bytes()[:6] == b"ARROW1"
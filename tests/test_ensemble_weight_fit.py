@@ -0,0 +1,41 @@
+"""Test ensemble simplex weight fitting."""
+
+import numpy as np
+from scipy.optimize import nnls
+
+from forecasting.models.ensemble import _fit_simplex_weights, _project_to_simplex
+
+
+def _wmape(X, y, w):
+    return np.abs(X @ w - y).sum() / y.sum()
+
+
+def _synthetic(n_models, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.uniform(1000, 3000, 400)
+    noise = rng.normal(0, [300, 150, 250, 400][:n_models], (400, n_models))
+    bias = np.array([50.0, -30.0, 0.0, 80.0][:n_models])
+    return y[:, None] + noise + bias, y
+
+
+def test_weights_on_simplex_and_no_worse_than_nnls_start():
+    """Test weights are non-negative, sum to 1, and do not lose wMAPE vs projected NNLS."""
+    X, y = _synthetic(4)
+    start = _project_to_simplex(nnls(X, y)[0])
+
+    weights = _fit_simplex_weights(X, y)
+
+    assert (weights >= 0).all()
+    assert np.isclose(weights.sum(), 1.0)
+    assert _wmape(X, y, weights) <= _wmape(X, y, start) + 1e-12
+
+
+def test_single_model_gets_full_weight():
+    """Test a single column returns the projected NNLS start, i.e. weight 1."""
+    X, y = _synthetic(1)
+    start = _project_to_simplex(nnls(X, y)[0])
+
+    weights = _fit_simplex_weights(X, y)
+
+    np.testing.assert_array_equal(weights, start)
+    np.testing.assert_array_equal(weights, [1.0])
@@ -0,0 +1,24 @@
+"""Test multi-day event regime features."""
+
+import pandas as pd
+
+from forecasting.features.spike_days import add_event_regime_features
+
+
+def test_regime_features_count_within_each_window():
+    """Test day_index/days_to_end restart per contiguous window and are 0 outside events."""
+    events = pd.DataFrame(
+        {
+            "ds": pd.date_range("2026-07-01", periods=6),
+            "event_family__fair": [1, 1, 1, 0, 1, 1],
+            "event_family__parade": [0, 0, 1, 0, 0, 0],
+        }
+    )
+    df = pd.DataFrame({"ds": pd.date_range("2026-06-30", periods=8)})
+    out = add_event_regime_features(df, events)
+
+    assert out["event_family__fair__day_index"].tolist() == [0, 0, 1, 2, 0, 0, 1, 0]
+    assert out["event_family__fair__days_to_end"].tolist() == [0, 2, 1, 0, 0, 1, 0, 0]
+    assert out["event_family__parade__day_index"].tolist() == [0] * 8
+    assert out["event_family__parade__days_to_end"].tolist() == [0] * 8
+    assert len(out) == len(df)
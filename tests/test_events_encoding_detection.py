@@ -0,0 +1,24 @@
+"""Test event CSV encoding detection reads only a bounded prefix."""
+
+from forecasting.io import events_ingest
+from forecasting.io.events_ingest import _detect_encoding
+
+
+def test_character_split_at_probe_boundary_is_utf8(tmp_path):
+    """Test a multi-byte character cut by the prefix limit does not trigger latin1."""
+    limit = events_ingest._ENCODING_PROBE_BYTES
+    path = tmp_path / "events.csv"
+    path.write_bytes(b"a" * (limit - 1) + "é".encode() + b"\nmore,rows\n")
+
+    assert _detect_encoding(str(path)) == "utf-8"
+
+
+def test_invalid_utf8_in_prefix_falls_back_to_latin1(tmp_path):
+    """Test invalid bytes inside the prefix pick latin1; BOMs still win."""
+    latin1 = tmp_path / "latin1.csv"
+    latin1.write_bytes("event_name\nFête\n".encode("latin1"))
+    bom = tmp_path / "bom.csv"
+    bom.write_bytes(b"\xef\xbb\xbfevent_name\nFair\n")
+
+    assert _detect_encoding(str(latin1)) == "latin1"
+    assert _detect_encoding(str(bom)) == "utf-8-sig"
@@ -0,0 +1,28 @@
+"""Test GBM long backtest workers hand their log records back to the parent."""
+
+import logging
+
+import pandas as pd
+
+from forecasting.models.gbm_long import _run_one_cutoff_logged
+
+
+def test_skipped_cutoff_returns_its_warning_record():
+    """Test a skipped cutoff returns None plus the captured warning, without emitting it."""
+    cutoff = pd.Timestamp("2025-01-01")
+    df_train_full = pd.DataFrame(
+        {"issue_date": [cutoff], "target_date": [cutoff], "y": [1.0], "f0": [0.0]}
+    )
+    package_logger = logging.getLogger("forecasting")
+    handlers_before = list(package_logger.handlers)
+
+    preds, records = _run_one_cutoff_logged(
+        logging.INFO, cutoff, df_train_full, None, None, None, cutoff, 380
+    )
+
+    assert preds is None
+    messages = [(r.levelno, r.getMessage()) for r in records]
+    assert (logging.INFO, f"Cutoff: {cutoff}") in messages
+    assert (logging.WARNING, f"Insufficient training data at cutoff {cutoff}") in messages
+    assert package_logger.handlers == handlers_before
+    assert package_logger.propagate
@@ -22,3 +22,26 @@ def test_holiday_distance_is_zero_on_holiday_itself():
     # On New Year, both until and since should be 0
     assert out.loc[out["ds"] == "2025-01-01", "days_until_new_year"].iloc[0] == 0
     assert out.loc[out["ds"] == "2025-01-01", "days_since_new_year"].iloc[0] == 0
+
+
+def test_holiday_distance_crosses_year_boundary_and_clamps():
+    """Test next/previous holidays are found across years and clamped, in any row order."""
+    df = pd.DataFrame({"ds": pd.to_datetime(["2026-07-01", "2025-12-31", "2026-01-02"])})
+    out = add_holiday_distance_features(df).set_index("ds")
+
+    nye = out.loc["2025-12-31"]
+    assert nye["days_until_new_year"] == 1
+    assert nye["days_since_christmas"] == 6
+    assert nye["days_since_thanksgiving"] == 34
+    assert nye["days_until_thanksgiving"] == 60
+
+    assert out.loc["2026-01-02", "days_since_new_year"] == 1
+    assert out.loc["2026-01-02", "days_since_christmas"] == 8
+
+    # Mid-year dates are far from every holiday
+    day_cols = [c for c in out.columns if c.startswith("days_")]
+    mid = out.loc["2026-07-01"]
+    assert (mid[day_cols] == 60).all()
+
+    # Clamped distances fit in int8
+    assert (out[day_cols].dtypes == "int8").all()
@@ -0,0 +1,21 @@
+"""Test vectorized horizon bucketing."""
+
+import pandas as pd
+
+from forecasting.backtest.rolling_origin import assign_horizon_bucket, assign_horizon_buckets
+
+
+def test_horizon_buckets_match_scalar_assignment():
+    """Test pd.cut bucketing agrees with assign_horizon_bucket, including out-of-range horizons."""
+    horizons = pd.Series(range(-2, 400))
+    expected = [assign_horizon_bucket(h) for h in horizons]
+
+    assert assign_horizon_buckets(horizons).tolist() == expected
+    assert assign_horizon_buckets(pd.Series([0, 1, 7, 8, 380, 381])).tolist() == [
+        "other",
+        "1-7",
+        "1-7",
+        "8-14",
+        "91-380",
+        "other",
+    ]
@@ -0,0 +1,53 @@
+"""Test hours calendar helpers."""
+
+import pandas as pd
+
+from forecasting.io.hours_calendar import (
+    build_hours_calendar_forecast,
+    calculate_open_minutes,
+    calculate_open_minutes_vec,
+)
+
+
+def test_open_minutes_vec_matches_scalar():
+    """Test the vectorized open-minutes helper agrees with the scalar one."""
+    opens = pd.Series(["10:00", "9:05", None, "bad", "11:00"])
+    closes = pd.Series(["21:00", "17:30", None, "20:00", None])
+
+    out = calculate_open_minutes_vec(opens, closes)
+
+    assert out.tolist() == [calculate_open_minutes(o, c) for o, c in zip(opens, closes)]
+
+
+def test_forecast_calendar_applies_overrides(tmp_path):
+    """Test overrides replace calendar hours and blank open_minutes are derived from times."""
+    calendar_path = tmp_path / "calendar.csv"
+    overrides_path = tmp_path / "overrides.csv"
+    pd.DataFrame(
+        {
+            "ds": ["2026-12-24", "2026-12-25", "2026-12-26"],
+            "open_time": ["10:00", "10:00", "10:00"],
+            "close_time": ["21:00", "21:00", "21:00"],
+            "is_closed": [False, False, False],
+            "open_minutes": [660, 660, 660],
+            "notes": ["", "", ""],
+        }
+    ).to_csv(calendar_path, index=False)
+    pd.DataFrame(
+        {
+            "ds": ["2026-12-24", "2026-12-25"],
+            "open_time": ["10:00", None],
+            "close_time": ["18:00", None],
+            "is_closed": [False, True],
+            "open_minutes": [None, 0],
+            "notes": ["Christmas Eve", "Christmas"],
+        }
+    ).to_csv(overrides_path, index=False)
+
+    out = build_hours_calendar_forecast(
+        str(calendar_path), str(overrides_path), str(tmp_path / "hours.parquet")
+    )
+
+    assert out["open_minutes"].tolist() == [480, 0, 660]
+    assert out["is_closed"].tolist() == [False, True, False]
+    assert out["close_time_local"].tolist()[0] == "18:00"
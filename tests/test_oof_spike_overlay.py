@@ -0,0 +1,91 @@
+"""
+Test OOF spike overlay multipliers and report.
+
+Tests:
+- Multipliers are median ratios, shrunk toward 1.0 and capped
+- The merged OOF frame can be returned and reused by the report
+- Overlapping flags use the max multiplier (no compounding), repeatably
+"""
+
+import pandas as pd
+
+from forecasting.features.oof_spike_overlay import (
+    apply_spike_overlay,
+    compute_oof_spike_multipliers,
+    generate_oof_overlay_report,
+)
+
+
+def _oof_inputs():
+    ds = pd.date_range("2025-11-20", periods=10)
+    preds = pd.DataFrame({"target_date": ds, "p50": [100.0] * 10})
+    actuals = pd.DataFrame({"ds": ds, "y": [100.0] * 8 + [150.0, 170.0]})
+    flags = pd.DataFrame(
+        {
+            "ds": ds,
+            "is_spike": [0] * 8 + [1, 1],
+            "is_never": [0] * 10,
+        }
+    )
+    return preds, actuals, flags
+
+
+def test_multiplier_is_shrunk_and_capped_median():
+    """Test that multipliers are median ratio shrunk toward 1.0, and empty flags are skipped."""
+    preds, actuals, flags = _oof_inputs()
+
+    mults = compute_oof_spike_multipliers(preds, actuals, flags, shrinkage=0.5)
+
+    # median ratio = 1.6 -> shrunk = 1.3
+    assert set(mults) == {"is_spike"}
+    assert abs(mults["is_spike"] - 1.3) < 1e-9
+
+    capped = compute_oof_spike_multipliers(preds, actuals, flags, shrinkage=1.0, cap_high=1.5)
+    assert capped["is_spike"] == 1.5
+
+
+def test_report_reuses_merged_frame(tmp_path):
+    """Test that the merged frame from compute_oof_spike_multipliers feeds the report."""
+    preds, actuals, flags = _oof_inputs()
+
+    mults, merged = compute_oof_spike_multipliers(
+        preds, actuals, flags, shrinkage=0.5, return_merged=True
+    )
+    assert "ratio" in merged.columns
+
+    forecast = pd.DataFrame({"ds": flags["ds"], "p50": 100.0, "overlay_multiplier": 1.0})
+    out_path = tmp_path / "report.md"
+    generate_oof_overlay_report(mults, forecast, str(out_path), df_merged=merged)
+
+    report = out_path.read_text()
+    assert "| is_spike | 2 | 1.600 | 1.300x |" in report
+
+
+def test_overlay_uses_max_multiplier_and_is_repeatable():
+    """Test that overlapping flags do not compound and repeated (cached) calls agree."""
+    forecast = pd.DataFrame(
+        {
+            "target_date": pd.date_range("2025-11-27", periods=3),
+            "p50": [100.0, 100.0, 100.0],
+            "p90": [200.0, 200.0, 200.0],
+        }
+    )
+    flags = pd.DataFrame(
+        {
+            "ds": pd.to_datetime(["2025-11-28", "2025-11-27"]),
+            "is_black_friday": [1, 0],
+            "is_day_after_thanksgiving": [1, 0],
+        }
+    )
+    mults = {"is_black_friday": 1.5, "is_day_after_thanksgiving": 1.2}
+
+    first = apply_spike_overlay(forecast, flags, mults)
+    second = apply_spike_overlay(forecast, flags, mults)
+
+    assert first["overlay_multiplier"].tolist() == [1.0, 1.5, 1.0]
+    assert first["p50"].tolist() == [100.0, 150.0, 100.0]
+    assert first["p90"].tolist() == [200.0, 300.0, 200.0]
+    pd.testing.assert_frame_equal(first, second)
+
+    # Input forecast is not modified
+    assert forecast["p50"].tolist() == [100.0, 100.0, 100.0]
@@ -0,0 +1,21 @@
+"""Test currency-string cleaning in ingest_sales."""
+
+import pandas as pd
+
+from forecasting.io.sales_ingest import ingest_sales
+
+
+def test_ingest_sales_parses_currency_strings(tmp_path):
+    """Test '$', ',' and surrounding whitespace are stripped before numeric parsing."""
+    csv_path = tmp_path / "sales.csv"
+    pd.DataFrame(
+        {
+            "yyyyMMdd": [20250101, 20250102, 20250103],
+            "Net sales": ["$1,234.50", " $150.00 ", "n/a"],
+        }
+    ).to_csv(csv_path, index=False)
+
+    out = ingest_sales(str(csv_path), str(tmp_path / "fact.parquet"))
+
+    assert out["y"].tolist() == [1234.5, 150.0]
+    assert out["is_closed"].tolist() == [False, True]
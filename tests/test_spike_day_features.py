@@ -0,0 +1,28 @@
+"""Test spike-day flag features."""
+
+import pandas as pd
+
+from forecasting.features.spike_days import SPIKE_DAY_FLAGS, add_spike_day_features
+
+
+def test_spike_day_features_flag_known_dates():
+    """Test flags are set on their holidays and clear elsewhere."""
+    df = pd.DataFrame(
+        {"ds": pd.to_datetime(["2026-11-26", "2026-11-27", "2026-12-31", "2026-03-03"])}
+    )
+    out = add_spike_day_features(df)
+
+    assert out["is_thanksgiving_day"].tolist() == [True, False, False, False]
+    assert out["is_black_friday"].tolist() == [False, True, False, False]
+    assert out["is_new_years_eve"].tolist() == [False, False, True, False]
+    assert not out.loc[3, list(SPIKE_DAY_FLAGS)].any()
+
+
+def test_spike_day_features_empty_frame():
+    """Test an empty frame gets every flag as an empty bool column instead of raising."""
+    df = pd.DataFrame({"ds": pd.Series([], dtype="datetime64[ns]")})
+    out = add_spike_day_features(df)
+
+    assert out.shape == (0, 1 + len(SPIKE_DAY_FLAGS))
+    assert list(out.columns) == ["ds", *SPIKE_DAY_FLAGS]
+    assert all(pd.api.types.is_bool_dtype(out[col]) for col in SPIKE_DAY_FLAGS)
@@ -0,0 +1,67 @@
+"""
+Test spike uplift overlay application.
+
+Tests:
+- Overlapping flags use the max multiplier (non-compounding)
+- adjustment_log records the active flags in the expected format
+- Forecasts without spike days pass through unadjusted
+"""
+
+import pandas as pd
+
+from forecasting.features.spike_uplift import apply_spike_uplift_overlay
+
+
+def test_overlay_uses_max_multiplier_and_logs_flags():
+    """Test that overlapping flags take the max multiplier and are logged together."""
+    df_forecast = pd.DataFrame(
+        {
+            "ds": pd.date_range("2026-11-26", periods=3),
+            "p50": [100.0, 100.0, 100.0],
+            "p80": [110.0, 110.0, 110.0],
+            "p90": [120.0, 120.0, 120.0],
+            "is_thanksgiving_day": [True, False, False],
+            "is_black_friday": [False, True, False],
+            "is_day_after_thanksgiving": [False, True, False],
+        }
+    )
+    df_uplift = pd.DataFrame(
+        {
+            "spike_flag": ["is_thanksgiving_day", "is_black_friday", "is_day_after_thanksgiving"],
+            "uplift_multiplier": [0.8, 1.5, 1.2],
+        }
+    )
+
+    out = apply_spike_uplift_overlay(df_forecast, df_uplift)
+
+    assert out["adjustment_multiplier"].tolist() == [0.8, 1.5, 1.0]
+    assert out["p50"].tolist() == [80.0, 150.0, 100.0]
+    assert out["p90"].tolist() == [96.0, 180.0, 120.0]
+    assert list(out["adjustment_log"]) == [
+        "is_thanksgiving_day=0.800",
+        "max(is_black_friday,is_day_after_thanksgiving)=1.500",
+        "",
+    ]
+
+    # Input forecast is not modified
+    assert df_forecast["p50"].tolist() == [100.0, 100.0, 100.0]
+
+
+def test_overlay_without_spike_days_leaves_forecast_unchanged():
+    """Test that a window with no active flags gets neutral multipliers and empty logs."""
+    df_forecast = pd.DataFrame(
+        {
+            "ds": pd.date_range("2026-03-02", periods=2),
+            "p50": [100.0, 90.0],
+            "p80": [110.0, 99.0],
+            "p90": [120.0, 108.0],
+            "is_black_friday": [False, False],
+        }
+    )
+    df_uplift = pd.DataFrame({"spike_flag": ["is_black_friday"], "uplift_multiplier": [1.5]})
+
+    out = apply_spike_uplift_overlay(df_forecast, df_uplift)
+
+    assert out["adjustment_multiplier"].tolist() == [1.0, 1.0]
+    assert out["p50"].tolist() == [100.0, 90.0]
+    assert list(out["adjustment_log"]) == ["", ""]